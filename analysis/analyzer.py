@@ -6,7 +6,14 @@ Prioritizes emotional safety, kindness, and clarity over technical perfection.
 """
 
 import re
-from analysis.parser_runner import parse_sentence, get_token_details
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from analysis.frozen import FrozenDict, freeze
+from analysis.parser_runner import run_sentence
+from analysis.rubric import Rubric, RubricLoader
+from config import Config
 
 
 class ContextAwareAnalyzer:
@@ -16,13 +23,16 @@ class ContextAwareAnalyzer:
     - Politeness basics
     - Goal appropriateness (soft, flexible)
     - Child-friendly communication
+
+    The pattern tables are read-only after __init__, so one instance
+    (get_analyzer()) is shared by all requests and threads.
     """
 
     def __init__(self):
         # ============================
         # SENTIMENT PATTERNS
         # ============================
-        self.sentiment_patterns = {
+        self.sentiment_patterns = freeze({
             "positive": [
                 r"\b(okay|ok|fine|good|nice|great|happy|glad|like|love)\b"
             ],
@@ -37,222 +47,95 @@ class ContextAwareAnalyzer:
             "apology": [
                 r"\b(sorry|apologize|my fault|my bad)\b"
             ]
-        }
+        })
 
         # ============================
         # STRUCTURE PATTERNS
         # ============================
-        self.polite_patterns = [
+        self.polite_patterns = (
             r"\b(hi|hello)\b",
             r"\b(please)\b",
             r"\b(thank you|thanks)\b",
             r"\b(could you|would you|can i|may i)\b",
             r"\b(maybe|i think|perhaps)\b"
-        ]
+        )
+
+        self.command_patterns = (
+            r"\b(you must|do it now|give me|stop that)\b",
+        )
 
-        self.command_patterns = [
-            r"\b(you must|do it now|give me|stop that)\b"
-        ]
+        # "asking_for_help" goal: a polite request word
+        self.help_patterns = (
+            r"\b(could|can|please)\b",
+        )
+
+        # All of the tables above, counted in one pass
+        self.scanner = get_scanner(
+            tuple(self.sentiment_patterns.items())
+            + (("polite", self.polite_patterns),
+               ("command", self.command_patterns),
+               ("help", self.help_patterns))
+        )
+
+        # Scoring rubric, compiled from the data file (hot reloaded)
+        self.rubric = RubricLoader(Config.RUBRIC_PATH, self.scanner.categories)
 
     # =====================================================
     # PUBLIC ENTRY
     # =====================================================
-    def analyze_sentence(self, text: str, scenario_goal: str = None) -> dict:
+    def analyze_sentence(self, text: str, scenario_goal: str = None,
+                         rubric: Rubric = None) -> dict:
         text_lower = text.lower()
 
-        tokens = parse_sentence(text)
-        token_details = get_token_details(text)
-
-        sentiment = self._analyze_sentiment(text_lower)
-        structure = self._analyze_structure(text_lower)
+        # Scoring only needs tokens: lex once, skip the parser entirely
+        parsed = run_sentence(text, mode="lex")
 
-        scores = self._calculate_scores(
-            text_lower,
-            sentiment,
-            structure,
-            scenario_goal
-        )
-
-        style = self._determine_style(scores)
+        result = self.score_text(text_lower, scenario_goal, rubric)
+        sentiment = result["sentiment"]
 
         return {
-            "tokens": tokens,
-            "token_details": token_details,
+            # Read-only TokenBuffer: token names (.names()) and per-token
+            # dicts are only built when read; .to_list() for JSON
+            "token_details": parsed.token_details,
             "sentiment": sentiment,
-            "structure": structure,
-            "scores": scores,
-            "overall_score": scores["overall"],
-            "style": style,
-            "strengths": self._strengths(text_lower, sentiment, structure),
+            "structure": result["structure"],
+            "scores": result["scores"],
+            "overall_score": result["overall_score"],
+            "style": result["style"],
+            "strengths": self._strengths(
+                text_lower, sentiment, result["structure"]
+            ),
             "weaknesses": self._weaknesses(text_lower, sentiment, scenario_goal)
         }
 
-    # =====================================================
-    # ANALYSIS HELPERS
-    # =====================================================
-    def _analyze_sentiment(self, text: str) -> dict:
-        result = {}
-        for k, patterns in self.sentiment_patterns.items():
-            result[k] = sum(len(re.findall(p, text)) for p in patterns)
-        return result
-
-    def _analyze_structure(self, text: str) -> dict:
-        polite = sum(len(re.findall(p, text)) for p in self.polite_patterns)
-        command = sum(len(re.findall(p, text)) for p in self.command_patterns)
-        return {
-            "polite": polite,
-            "command": command
+    def score_text(self, text_lower: str, scenario_goal: str = None,
+                   rubric: Rubric = None) -> dict:
+        """
+        The rubric alone (no lexer): sentiment/structure counts, score
+        breakdown and style. Cheap enough to run on every keystroke.
+        """
+        rubric = rubric or self.rubric.get()
+        counts = self.scanner.count(text_lower)
+        sentiment = {k: counts[k] for k in self.sentiment_patterns}
+        structure = {
+            "polite": counts["polite"],
+            "command": counts["command"]
         }
 
-    # =====================================================
-    # SCORING (EDUCATION-FIRST RUBRIC + BREAKDOWN)
-    # =====================================================
-    def _calculate_scores(self, text, sentiment, structure, goal):
-        total = 0
-        breakdown = {}
-
-        # =================================================
-        # 1️⃣ Emotional Safety (max 40)
-        # =================================================
-        emo_score = 0
-        emo_reasons = []
-
-        if sentiment["negative"] == 0:
-            emo_score += 15
-            emo_reasons.append("+15: Uses no hurtful or angry words")
-
-        if sentiment["empathy"] > 0:
-            emo_score += 15
-            emo_reasons.append("+15: Shows understanding or kindness")
-
-        if sentiment["positive"] > 0:
-            emo_score += 10
-            emo_reasons.append("+10: Says something positive")
-
-        breakdown["emotional_safety"] = {
-            "score": emo_score,
-            "max": 40,
-            "reasons": emo_reasons
-        }
-        total += emo_score
-
-        # =================================================
-        # 2️⃣ Politeness Basics (max 25)
-        # =================================================
-        polite_score = min(25, structure["polite"] * 5)
-        polite_reasons = []
-
-        if structure["polite"] > 0:
-            polite_reasons.append(
-                f"+{polite_score}: Uses polite or gentle words"
-            )
-
-        breakdown["politeness"] = {
-            "score": polite_score,
-            "max": 25,
-            "reasons": polite_reasons
-        }
-        total += polite_score
-
-        # =================================================
-        # 3️⃣ Goal Appropriateness (max 20)
-        # =================================================
-        goal_score = 0
-        goal_reasons = []
-
-        if goal == "giving_feedback":
-            if sentiment["positive"] > 0:
-                goal_score += 10
-                goal_reasons.append(
-                    "+10: Says something nice before giving feedback"
-                )
-            if "maybe" in text or sentiment["empathy"] > 0:
-                goal_score += 10
-                goal_reasons.append(
-                    "+10: Gives a gentle suggestion"
-                )
-
-        elif goal == "polite_refusal":
-            if "thank" in text:
-                goal_score += 10
-                goal_reasons.append("+10: Says thank you politely")
-            if "because" in text or "but" in text:
-                goal_score += 10
-                goal_reasons.append(
-                    "+10: Explains reason kindly"
-                )
-
-        elif goal == "apologizing":
-            if sentiment["apology"] > 0:
-                goal_score += 20
-                goal_reasons.append("+20: Gives a clear apology")
-            elif sentiment["empathy"] > 0:
-                goal_score += 10
-                goal_reasons.append("+10: Shows understanding")
-
-        elif goal == "asking_for_help":
-            if re.search(r"\b(could|can|please)\b", text):
-                goal_score += 20
-                goal_reasons.append(
-                    "+20: Asks for help politely"
-                )
-
-        else:
-            goal_score += 15
-            goal_reasons.append("+15: Communicates kindly")
-
-        breakdown["goal_fit"] = {
-            "score": goal_score,
-            "max": 20,
-            "reasons": goal_reasons
-        }
-        total += goal_score
-
-        # =================================================
-        # 4️⃣ Clarity & Tone (max 15)
-        # =================================================
-        clarity_score = 10
-        clarity_reasons = ["+10: Sentence is clear and easy to understand"]
-
-        if structure["command"] == 0:
-            clarity_score += 5
-            clarity_reasons.append(
-                "+5: Does not sound bossy or commanding"
-            )
-
-        breakdown["clarity"] = {
-            "score": clarity_score,
-            "max": 15,
-            "reasons": clarity_reasons
-        }
-        total += clarity_score
-
-        # Gentle internal penalties (NOT shown to kids)
-        if sentiment["negative"] > 0:
-            total -= 5
-        if structure["command"] > 0:
-            total -= 5
+        scores = rubric.score(text_lower, counts, scenario_goal)
 
         return {
-            "overall": max(0, min(100, int(total))),
-            "breakdown": breakdown
+            "sentiment": sentiment,
+            "structure": structure,
+            "scores": scores,
+            "overall_score": scores["overall"],
+            "style": rubric.style(scores["overall"])
         }
 
     # =====================================================
-    # STYLE & FEEDBACK
+    # SCORING (EDUCATION-FIRST RUBRIC + BREAKDOWN)
     # =====================================================
-    def _determine_style(self, scores):
-        s = scores["overall"]
-        if s >= 85:
-            return "very_polite"
-        if s >= 70:
-            return "polite"
-        if s >= 55:
-            return "neutral"
-        if s >= 40:
-            return "needs_improvement"
-        return "harsh"
-
+    # Weights, per-goal rules and style bands: analysis/rubric.json
     def _strengths(self, text, sentiment, structure):
         s = []
         if sentiment["empathy"] > 0:
@@ -275,8 +158,225 @@ class ContextAwareAnalyzer:
 
 
 # =====================================================
-# COMPATIBILITY WRAPPER
+# COMBINED PATTERN SCANNER
 # =====================================================
+class PatternScanner:
+    """
+    Counts every rubric pattern in ONE pass over the text.
+
+    The rubric patterns are word alternations, r"\\b(thank you|thanks)\\b".
+    Their alternatives are indexed by first word, so the scan walks the
+    words of the text once and only looks at phrases that start with
+    the current word. Per pattern it keeps re's semantics: the first
+    alternative (in order) that ends on a word boundary wins, and a
+    match that starts inside the previous match of the same pattern is
+    skipped - the counts equal len(re.findall(pattern, text)).
+
+    Matches of different patterns may overlap ("can i think" counts
+    both "can i" and "i think"), as they did with separate findall()
+    calls. A pattern of any other shape is counted with its own
+    precompiled findall().
+    """
+
+    def __init__(self, categories):
+        # categories: ((category, (pattern, ...)), ...)
+        self.categories = tuple(category for category, _ in categories)
+        # first word -> ((pattern index, phrase, category), ...)
+        self.phrases = {}
+        self.fallback = []
+
+        index = 0
+        for category, patterns in categories:
+            for pattern in patterns:
+                alternatives = _literal_alternatives(pattern)
+                if alternatives is None:
+                    self.fallback.append((re.compile(pattern), category))
+                    continue
+                for phrase in alternatives:
+                    first_word = _WORD_RE.match(phrase).group()
+                    self.phrases.setdefault(first_word, []).append(
+                        (index, phrase, category)
+                    )
+                index += 1
+
+        self.phrases = {
+            word: tuple(entries) for word, entries in self.phrases.items()
+        }
+
+    def count(self, text: str) -> dict:
+        """{category: number of matches} for every category."""
+        counts = dict.fromkeys(self.categories, 0)
+        phrases = self.phrases
+        length = len(text)
+        last_end = {}
+
+        for word in _WORD_RE.finditer(text):
+            entries = phrases.get(word.group())
+            if entries is None:
+                continue
+
+            start = word.start()
+            matched = -1
+            for index, phrase, category in entries:
+                if index == matched:
+                    continue
+                end = start + len(phrase)
+                if (text.startswith(phrase, start)
+                        and (end == length or not _is_word_char(text, end))):
+                    matched = index
+                    if start >= last_end.get(index, 0):
+                        counts[category] += 1
+                        last_end[index] = end
+
+        for regex, category in self.fallback:
+            counts[category] += len(regex.findall(text))
+        return counts
+
+
+_WORD_RE = re.compile(r"\w+")
+_is_word_char = re.compile(r"\w").match
+_WORD_ALTERNATION_RE = re.compile(r"\\b\(([^()]*)\)\\b")
+
+
+def _literal_alternatives(pattern: str):
+    """
+    ["thank you", "thanks"] for r"\\b(thank you|thanks)\\b", or None
+    when the pattern is not an alternation of plain words.
+    """
+    match = _WORD_ALTERNATION_RE.fullmatch(pattern)
+    if match is None:
+        return None
+    alternatives = match.group(1).split("|")
+    for phrase in alternatives:
+        if (re.escape(phrase).replace("\\ ", " ") != phrase
+                or not _is_word_char(phrase)
+                or not _is_word_char(phrase, len(phrase) - 1)):
+            return None
+    return alternatives
+
+
+@lru_cache(maxsize=16)
+def get_scanner(categories: tuple) -> PatternScanner:
+    """Compiled scanner per distinct pattern table (compiled once)."""
+    return PatternScanner(categories)
+
+
+# =====================================================
+# RESULT CACHE
+# =====================================================
+_TRAILING_PUNCT_RE = re.compile(r"[\s.!?,;]+$")
+
+
+def normalize_answer(text: str) -> str:
+    """
+    Cache-key form of an answer: lower case, surrounding whitespace and
+    trailing punctuation dropped ("Sorry!! " -> "sorry"). Internal
+    whitespace is kept: "thank  you" does not match "thank you", so it
+    would change the scores.
+    """
+    return _TRAILING_PUNCT_RE.sub("", text.lower()).lstrip()
+
+
+class AnalysisCache:
+    """
+    Bounded LRU cache of analysis results keyed by
+    (normalize_answer(text), scenario_goal, rubric signature), so a
+    rubric reload never serves scores from the previous rubric.
+
+    Results are deep-frozen (FrozenDict / tuple) because every caller
+    of a cached entry shares the same object.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, text: str, scenario_goal: str, compute,
+                       rubric_signature: str = None):
+        """Return the cached result, or compute(text) and store it."""
+        key = (normalize_answer(text), scenario_goal, rubric_signature)
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Computed outside the lock; a concurrent miss on the same key
+        # just computes the same value twice
+        result = freeze(compute(text))
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else None
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_cache = AnalysisCache(Config.ANALYSIS_CACHE_SIZE)
+
+
+def get_analysis_cache_stats() -> dict:
+    return _cache.stats()
+
+
+def clear_analysis_cache():
+    _cache.clear()
+
+
+# =====================================================
+# SHARED INSTANCE + COMPATIBILITY WRAPPER
+# =====================================================
+_analyzer = ContextAwareAnalyzer()
+
+
+def get_analyzer() -> ContextAwareAnalyzer:
+    return _analyzer
+
+
 def analyze_sentence(text: str, scenario_goal: str = None) -> dict:
-    analyzer = ContextAwareAnalyzer()
-    return analyzer.analyze_sentence(text, scenario_goal)
+    """
+    Cached analysis: "Sorry!" and "sorry" share one entry (the scores
+    only see the lower-cased words). The tokens always describe `text`
+    itself; an entry computed for another spelling is only re-lexed.
+    The returned dict is read-only.
+    """
+    rubric = _analyzer.rubric.get()
+
+    def compute(answer: str) -> dict:
+        return _analyzer.analyze_sentence(answer, scenario_goal, rubric)
+
+    result = _cache.get_or_compute(
+        text, scenario_goal, compute, rubric.signature
+    )
+    if result["token_details"].text != text.lower():
+        result = FrozenDict(
+            result, token_details=run_sentence(text, mode="lex").token_details
+        )
+    return result
@@ -0,0 +1,116 @@
+"""
+batch.py - Analyze many sentences at once across worker processes
+
+For bulk jobs such as a class's uploaded answers. Work is cut into
+chunks and fanned out over a ProcessPoolExecutor:
+- each worker loads the DFA cache (or warms up) once, so its lexer
+  and parser are hot before the first chunk
+- results are yielded IN INPUT ORDER as a generator
+- only a few chunks per worker are in flight at any time, so memory
+  stays bounded however long the input is
+
+parse_many() takes plain texts (parsing has no goal);
+analyze_many() takes (text, goal) pairs.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from analysis.parser_runner import SentenceParseResult, run_sentence
+from config import Config
+
+DEFAULT_CHUNK_SIZE = 64
+
+# Chunks submitted per worker before waiting for the oldest one
+MAX_PENDING_PER_WORKER = 2
+
+
+# =====================================================
+# PUBLIC API
+# =====================================================
+def parse_many(texts, mode: str = "validate", workers: int = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Lex/parse every text, yielding SentenceParseResult objects in order.
+
+    mode is "lex" or "validate"; parse trees cannot leave a worker
+    process. workers=0 runs everything in this process; the default
+    is one worker per CPU.
+    """
+    if mode not in ("lex", "validate"):
+        raise ValueError(f"Unsupported batch parse mode: {mode}")
+
+    for fields in _fan_out(_parse_chunk, texts, workers, chunk_size, mode):
+        yield SentenceParseResult(*fields)
+
+
+def analyze_many(pairs, workers: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Run analyze_sentence() on every (text, goal) pair, yielding the
+    analysis dicts in order. workers=0 runs everything in this process;
+    the default is one worker per CPU.
+    """
+    return _fan_out(_analyze_chunk, pairs, workers, chunk_size)
+
+
+# =====================================================
+# WORKER SIDE
+# =====================================================
+def _init_worker():
+    """Make this worker's lexer/parser DFAs hot before any real work."""
+    from analysis.warmup import prepare
+    prepare(Config.ANTLR_DFA_CACHE or None)
+
+
+def _parse_chunk(texts: list, mode: str) -> list:
+    results = []
+    for text in texts:
+        r = run_sentence(text, mode=mode)
+        results.append((r.buffer, r.errors, r.parse_path))
+    return results
+
+
+def _analyze_chunk(pairs: list) -> list:
+    from analysis.analyzer import analyze_sentence
+    return [analyze_sentence(text, goal) for text, goal in pairs]
+
+
+# =====================================================
+# FAN-OUT
+# =====================================================
+def _chunks(items, size: int):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _fan_out(fn, items, workers, chunk_size: int, *args):
+    """Apply fn to chunks of items, yielding the flattened results in order."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is None:
+        # One worker process on a single CPU only adds pickling overhead
+        cpus = os.cpu_count() or 1
+        workers = cpus if cpus > 1 else 0
+
+    if workers == 0:
+        for chunk in _chunks(items, chunk_size):
+            yield from fn(chunk, *args)
+        return
+
+    max_pending = workers * MAX_PENDING_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(fn, chunk, *args))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,112 @@
+"""
+benchmark_parser.py - Per-call cost of fresh vs pooled ANTLR instances
+
+Simulates a multi-threaded WSGI server: N worker threads each analyze
+a stream of answers, once building a new lexer/parser per call (the old
+behaviour) and once using the thread-local SentencePipeline.
+
+Usage (from the project root):
+    python -m analysis.benchmark_parser [--threads 8] [--calls 2000]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from antlr4 import InputStream, CommonTokenStream
+
+from analysis.generated.SentenceLexer import SentenceLexer
+from analysis.generated.SentenceParser import SentenceParser
+from analysis.parser_runner import SentenceErrorListener, get_pipeline
+
+SAMPLE_ANSWERS = [
+    "Hi, could you please help me with this problem? Thank you!",
+    "I am really sorry, I didn't mean to break your pencil.",
+    "Thank you for inviting me, but I feel tired today.",
+    "I like your drawing, maybe you could add a tail.",
+    "No! I don't want to play with you.",
+    "You must give it back right now",
+    "sorry",
+    "I think your idea is good, but maybe we can try another way.",
+]
+
+
+def run_fresh(text: str):
+    """The pre-pool code path: new lexer, parser and listener per call."""
+    lexer = SentenceLexer(InputStream(text.lower()))
+    listener = SentenceErrorListener()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+
+    parser = SentenceParser(stream)
+    parser.removeErrorListeners()
+    parser.addErrorListener(listener)
+    parser.sentence()
+    return listener.errors
+
+
+def run_pooled(text: str):
+    """The pooled code path: reset this thread's pipeline."""
+    pipeline = get_pipeline()
+    pipeline.lex(text.lower())
+    pipeline.parse()
+    return pipeline.error_listener.errors
+
+
+def construct_only(_text: str):
+    """Cost of building the objects alone, without lexing or parsing."""
+    lexer = SentenceLexer(InputStream(""))
+    SentenceParser(CommonTokenStream(lexer))
+
+
+def _worker(fn, calls: int):
+    for i in range(calls):
+        fn(SAMPLE_ANSWERS[i % len(SAMPLE_ANSWERS)])
+
+
+def measure(fn, threads: int, calls: int) -> float:
+    """Return microseconds per call across all threads."""
+    # Warm the shared DFA caches so only construction cost differs
+    _worker(fn, len(SAMPLE_ANSWERS) * 4)
+
+    per_thread = max(1, calls // threads)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(_worker, fn, per_thread) for _ in range(threads)
+        ]
+        for f in futures:
+            f.result()
+    elapsed = time.perf_counter() - start
+
+    return elapsed / (per_thread * threads) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"ANTLR pipeline benchmark: {args.threads} threads, "
+          f"{args.calls} calls")
+    print("=" * 60)
+
+    for threads in sorted({1, args.threads}):
+        fresh = measure(run_fresh, threads, args.calls)
+        pooled = measure(run_pooled, threads, args.calls)
+        saving = (fresh - pooled) / fresh * 100
+
+        print(f"threads={threads:<3} fresh={fresh:8.1f} us/call  "
+              f"pooled={pooled:8.1f} us/call  saving={saving:5.1f}%")
+
+    construct = measure(construct_only, 1, args.calls)
+    print(f"construction alone: {construct:.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
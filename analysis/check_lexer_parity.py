@@ -0,0 +1,109 @@
+"""
+check_lexer_parity.py - Differential check: FastSentenceLexer vs SentenceLexer
+
+Builds a random corpus from the grammar vocabulary (keywords, phrases,
+prefixes of keywords, contractions, emoticons, digits, odd characters
+and whitespace), lexes every line with both lexers and compares them
+token-for-token (type, text, start, stop, line, column) plus the
+lexical errors. Exits with status 1 on the first mismatches.
+
+Usage (from the project root):
+    python -m analysis.check_lexer_parity [--size 20000] [--seed 7]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from analysis.fast_lexer import get_fast_lexer, load_lexer_rules
+from analysis.parser_runner import get_pipeline
+
+NOISE = [
+    " ", "  ", "\n", "\t", "\r\n", ",", ";", ":", ".", "!", "?", "'", '"',
+    "-", "<", "<3", ":)", ":-", ":-)", ";)", ";-", "€", "é", "~", "_", "x'",
+    "'s", "0", "42", "3", "(", ")", "&",
+]
+
+
+def build_corpus(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+
+    vocabulary = []
+    for _, _, literals, _ in load_lexer_rules():
+        vocabulary.extend(literals)
+    fragments = [w[:rng.randint(1, len(w))] for w in vocabulary]
+    words = ["dinosaur", "pencil", "it's", "alex's", "tail", "abc", "zzz"]
+
+    pools = [vocabulary, fragments, words, NOISE]
+
+    corpus = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            pool = rng.choices(pools, weights=[5, 2, 2, 3])[0]
+            piece = rng.choice(pool)
+            if rng.random() < 0.1:
+                piece = piece.upper()
+            parts.append(piece)
+            parts.append(rng.choice(["", " ", " ", " ", "  ", "\n"]))
+        corpus.append("".join(parts))
+    return corpus
+
+
+def antlr_tokens(text: str) -> tuple:
+    pipeline = get_pipeline()
+    stream = pipeline.lex(text)
+    tokens = [
+        (t.type, t.text if t.type != -1 else None,
+         t.start, t.stop, t.line, t.column)
+        for t in stream.tokens
+    ]
+    return tokens, list(pipeline.error_listener.errors)
+
+
+def fast_tokens(text: str) -> tuple:
+    tokens, errors = get_fast_lexer().tokenize(text)
+    return [
+        (type_, text[start:stop + 1] if type_ != -1 else None,
+         start, stop, line, column)
+        for type_, start, stop, line, column in tokens
+    ], errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size, args.seed)
+
+    mismatches = 0
+    antlr_time = fast_time = 0.0
+    for text in corpus:
+        start = time.perf_counter()
+        expected = antlr_tokens(text)
+        antlr_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = fast_tokens(text)
+        fast_time += time.perf_counter() - start
+
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"✗ Mismatch for {text!r}")
+                print(f"  antlr: {expected}")
+                print(f"  fast:  {actual}")
+
+    print(f"Checked {len(corpus)} lines: {mismatches} mismatches")
+    print(f"ANTLR lexer: {antlr_time * 1000:.0f} ms, "
+          f"fast lexer: {fast_time * 1000:.0f} ms "
+          f"({antlr_time / max(fast_time, 1e-9):.1f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
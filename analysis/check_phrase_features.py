@@ -0,0 +1,120 @@
+"""
+check_phrase_features.py - Check of the parse-tree phrase features
+
+feature_extractor.SentenceFeatureVisitor counts the phrases of a parse
+tree in one visitor walk. This script recounts every tree with a plain
+recursive walk over the rule contexts (no visitor dispatch) and
+compares the two over the warm-up corpus, the sample answers and the
+check_scanner_parity corpus. A few hand-checked sentences pin what the
+counts mean. Exits with status 1 on mismatches.
+
+Usage (from the project root):
+    python -m analysis.check_phrase_features [--size 2000] [--seed 7]
+"""
+
+import argparse
+import sys
+
+from antlr4.tree.Tree import ErrorNode, TerminalNode
+
+from analysis.analyzer import get_analyzer
+from analysis.benchmark_parser import SAMPLE_ANSWERS
+from analysis.check_scanner_parity import build_corpus
+from analysis.feature_extractor import (
+    FEATURE_NAMES, SOFTENER_TOKENS, extract_features, extract_features_from_tree
+)
+from analysis.generated.SentenceParser import SentenceParser
+from analysis.parser_runner import run_sentence
+from analysis.warmup import WARMUP_CORPUS
+
+# Rule context -> feature it counts
+CONTEXT_FEATURES = {
+    SentenceParser.Polite_phraseContext: "polite_phrases",
+    SentenceParser.Apology_phraseContext: "apology_phrases",
+    SentenceParser.Request_phraseContext: "request_phrases",
+    SentenceParser.Emotional_expressionContext: "emotional_expressions",
+    SentenceParser.Question_phraseContext: "question_phrases",
+    SentenceParser.Strong_expressionContext: "strong_expressions",
+}
+
+# Hand-checked: sentence -> non-zero features
+EXPECTED = {
+    "Hi, could you please help me with this problem? Thank you!": {
+        "request_phrases": 1, "softeners": 2, "polite_phrases": 2,
+        "has_greeting": 1,
+    },
+    "I am really sorry, I didn't mean to break your pencil.": {
+        "apology_phrases": 1, "strong_expressions": 2,
+    },
+    "Maybe we could share, I think that is okay.": {
+        "softeners": 3, "polite_phrases": 3,
+    },
+    "You must give it back right now": {"strong_expressions": 2},
+    "": {},
+}
+
+
+def reference_features(tree) -> dict:
+    """The visitor's counts, from a plain recursive walk."""
+    features = dict.fromkeys(FEATURE_NAMES, 0)
+
+    def walk(node):
+        if isinstance(node, TerminalNode):
+            # Tokens skipped by error recovery belong to no phrase
+            if (not isinstance(node, ErrorNode)
+                    and node.getSymbol().type in SOFTENER_TOKENS):
+                features["softeners"] += 1
+            return
+        if isinstance(node, SentenceParser.GreetingContext):
+            features["has_greeting"] = 1
+        elif isinstance(node, SentenceParser.ClosingContext):
+            features["has_closing"] = 1
+        elif isinstance(node, SentenceParser.Polite_closingContext):
+            if node.APOLOGY_WORD() is not None:
+                features["apology_phrases"] += 1
+        elif type(node) in CONTEXT_FEATURES:
+            features[CONTEXT_FEATURES[type(node)]] += 1
+        for child in node.getChildren():
+            walk(child)
+
+    if tree is not None:
+        walk(tree)
+    return features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = list(WARMUP_CORPUS) + list(SAMPLE_ANSWERS)
+    corpus += build_corpus(get_analyzer(), args.size, args.seed)
+
+    mismatches = 0
+    for text in corpus:
+        tree = run_sentence(text, mode="tree").tree
+        expected = reference_features(tree)
+        actual = extract_features_from_tree(tree)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"✗ Mismatch for {text!r}")
+                print(f"  reference: {expected}")
+                print(f"  visitor:   {actual}")
+
+    for text, wanted in EXPECTED.items():
+        actual = {k: v for k, v in extract_features(text).items() if v}
+        if actual != wanted:
+            mismatches += 1
+            print(f"✗ Unexpected features for {text!r}")
+            print(f"  expected: {wanted}")
+            print(f"  actual:   {actual}")
+
+    print(f"Checked {len(corpus)} trees and {len(EXPECTED)} hand-checked "
+          f"sentences: {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
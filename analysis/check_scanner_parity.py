@@ -0,0 +1,279 @@
+"""
+check_scanner_parity.py - Differential check: PatternScanner vs per-pattern regexes
+
+ContextAwareAnalyzer.score_text() counts the rubric patterns in one
+pass over the words (PatternScanner, a first-word index of the phrase
+alternatives) and scores them with the compiled rubric.json. This
+script keeps the previous implementation - one re.findall() per
+pattern, re.search() for the "asking_for_help" check and a frozen copy
+of the hand-written scoring and style bands the rubric replaced - and
+compares the complete score_text() output (counts, score breakdown,
+style) for every scenario goal over the sample answers plus a random
+corpus built from the rubric phrases. Exits with status 1 on
+mismatches, which an intentional rubric.json edit also causes.
+
+Usage (from the project root):
+    python -m analysis.check_scanner_parity [--size 20000] [--seed 7]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from analysis.analyzer import ContextAwareAnalyzer
+from analysis.benchmark_parser import SAMPLE_ANSWERS
+
+GOALS = [None, "giving_feedback", "polite_refusal", "apologizing",
+         "asking_for_help", "unknown_goal"]
+
+FILLER = [
+    "i", "you", "it", "is", "the", "my", "me", "can", "could", "think",
+    "okay", "ok", "thank", "because", "but", "maybe", "didn't", "it's",
+    "cannot", "sorryy", "unhappy", "knows", "nicely",
+]
+
+NOISE = [" ", "  ", "\n", ",", ".", "!", "?", "'", "-", "'s", "…", "é"]
+
+
+def rubric_phrases(analyzer: ContextAwareAnalyzer) -> list:
+    """Every alternative of every rubric pattern, e.g. "thank you"."""
+    patterns = [p for ps in analyzer.sentiment_patterns.values() for p in ps]
+    patterns += analyzer.polite_patterns + analyzer.command_patterns
+    patterns += analyzer.help_patterns
+    phrases = []
+    for pattern in patterns:
+        for group in re.findall(r"\(([^()]*)\)", pattern):
+            phrases.extend(group.split("|"))
+    return phrases
+
+
+def build_corpus(analyzer: ContextAwareAnalyzer, size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    phrases = rubric_phrases(analyzer)
+    pools = [phrases, FILLER, NOISE]
+
+    corpus = [answer.lower() for answer in SAMPLE_ANSWERS]
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, 14)):
+            parts.append(rng.choice(rng.choices(pools, weights=[5, 3, 2])[0]))
+            # No separator sometimes, to glue words ("sorrysorry")
+            parts.append(rng.choice(["", " ", " ", " ", ", "]))
+        corpus.append("".join(parts))
+    return corpus
+
+
+def reference_score(analyzer: ContextAwareAnalyzer, text: str, goal) -> dict:
+    """score_text() as it was before the combined scanner and rubric.json."""
+    sentiment = {
+        k: sum(len(re.findall(p, text)) for p in patterns)
+        for k, patterns in analyzer.sentiment_patterns.items()
+    }
+    structure = {
+        "polite": sum(len(re.findall(p, text))
+                      for p in analyzer.polite_patterns),
+        "command": sum(len(re.findall(p, text))
+                       for p in analyzer.command_patterns)
+    }
+    asks_politely = re.search(r"\b(could|can|please)\b", text) is not None
+
+    scores = reference_scores(text, sentiment, structure, goal, asks_politely)
+    return {
+        "sentiment": sentiment,
+        "structure": structure,
+        "scores": scores,
+        "overall_score": scores["overall"],
+        "style": reference_style(scores)
+    }
+
+
+# =====================================================
+# SCORING BEFORE rubric.json (frozen copy, do not edit)
+# =====================================================
+def reference_scores(text, sentiment, structure, goal,
+                     asks_politely=False):
+    total = 0
+    breakdown = {}
+
+    # =================================================
+    # 1️⃣ Emotional Safety (max 40)
+    # =================================================
+    emo_score = 0
+    emo_reasons = []
+
+    if sentiment["negative"] == 0:
+        emo_score += 15
+        emo_reasons.append("+15: Uses no hurtful or angry words")
+
+    if sentiment["empathy"] > 0:
+        emo_score += 15
+        emo_reasons.append("+15: Shows understanding or kindness")
+
+    if sentiment["positive"] > 0:
+        emo_score += 10
+        emo_reasons.append("+10: Says something positive")
+
+    breakdown["emotional_safety"] = {
+        "score": emo_score,
+        "max": 40,
+        "reasons": emo_reasons
+    }
+    total += emo_score
+
+    # =================================================
+    # 2️⃣ Politeness Basics (max 25)
+    # =================================================
+    polite_score = min(25, structure["polite"] * 5)
+    polite_reasons = []
+
+    if structure["polite"] > 0:
+        polite_reasons.append(
+            f"+{polite_score}: Uses polite or gentle words"
+        )
+
+    breakdown["politeness"] = {
+        "score": polite_score,
+        "max": 25,
+        "reasons": polite_reasons
+    }
+    total += polite_score
+
+    # =================================================
+    # 3️⃣ Goal Appropriateness (max 20)
+    # =================================================
+    goal_score = 0
+    goal_reasons = []
+
+    if goal == "giving_feedback":
+        if sentiment["positive"] > 0:
+            goal_score += 10
+            goal_reasons.append(
+                "+10: Says something nice before giving feedback"
+            )
+        if "maybe" in text or sentiment["empathy"] > 0:
+            goal_score += 10
+            goal_reasons.append(
+                "+10: Gives a gentle suggestion"
+            )
+
+    elif goal == "polite_refusal":
+        if "thank" in text:
+            goal_score += 10
+            goal_reasons.append("+10: Says thank you politely")
+        if "because" in text or "but" in text:
+            goal_score += 10
+            goal_reasons.append(
+                "+10: Explains reason kindly"
+            )
+
+    elif goal == "apologizing":
+        if sentiment["apology"] > 0:
+            goal_score += 20
+            goal_reasons.append("+20: Gives a clear apology")
+        elif sentiment["empathy"] > 0:
+            goal_score += 10
+            goal_reasons.append("+10: Shows understanding")
+
+    elif goal == "asking_for_help":
+        if asks_politely:
+            goal_score += 20
+            goal_reasons.append(
+                "+20: Asks for help politely"
+            )
+
+    else:
+        goal_score += 15
+        goal_reasons.append("+15: Communicates kindly")
+
+    breakdown["goal_fit"] = {
+        "score": goal_score,
+        "max": 20,
+        "reasons": goal_reasons
+    }
+    total += goal_score
+
+    # =================================================
+    # 4️⃣ Clarity & Tone (max 15)
+    # =================================================
+    clarity_score = 10
+    clarity_reasons = ["+10: Sentence is clear and easy to understand"]
+
+    if structure["command"] == 0:
+        clarity_score += 5
+        clarity_reasons.append(
+            "+5: Does not sound bossy or commanding"
+        )
+
+    breakdown["clarity"] = {
+        "score": clarity_score,
+        "max": 15,
+        "reasons": clarity_reasons
+    }
+    total += clarity_score
+
+    # Gentle internal penalties (NOT shown to kids)
+    if sentiment["negative"] > 0:
+        total -= 5
+    if structure["command"] > 0:
+        total -= 5
+
+    return {
+        "overall": max(0, min(100, int(total))),
+        "breakdown": breakdown
+    }
+
+
+def reference_style(scores):
+    s = scores["overall"]
+    if s >= 85:
+        return "very_polite"
+    if s >= 70:
+        return "polite"
+    if s >= 55:
+        return "neutral"
+    if s >= 40:
+        return "needs_improvement"
+    return "harsh"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    analyzer = ContextAwareAnalyzer()
+    corpus = build_corpus(analyzer, args.size, args.seed)
+
+    mismatches = 0
+    reference_time = scanner_time = 0.0
+    for text in corpus:
+        for goal in GOALS:
+            start = time.perf_counter()
+            expected = reference_score(analyzer, text, goal)
+            reference_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = analyzer.score_text(text, goal)
+            scanner_time += time.perf_counter() - start
+
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"✗ Mismatch for {text!r} (goal={goal})")
+                    print(f"  reference: {expected}")
+                    print(f"  scanner:   {actual}")
+
+    checks = len(corpus) * len(GOALS)
+    print(f"Checked {checks} (answer, goal) pairs: {mismatches} mismatches")
+    print(f"Per-pattern regexes: {reference_time * 1000:.0f} ms, "
+          f"combined scanner: {scanner_time * 1000:.0f} ms "
+          f"({reference_time / max(scanner_time, 1e-9):.1f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+check_vector_parity.py - Differential check: score_matrix() vs score_text()
+
+Scores the check_scanner_parity corpus for every scenario goal both
+ways - ContextAwareAnalyzer.score_text() per answer and
+vector_scoring.score_matrix() over the feature matrix, both with the
+current rubric.json - and compares every breakdown section, the
+overall score and the style. Then times score_matrix() on the matrix
+tiled to --rows rows. Exits with status 1 on mismatches.
+
+Usage (from the project root):
+    python -m analysis.check_vector_parity [--size 20000] [--rows 1000000]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from analysis.analyzer import get_analyzer, normalize_answer
+from analysis.check_scanner_parity import GOALS, build_corpus
+from analysis.vector_scoring import (
+    encode_goals, extract_features, score_matrix
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    analyzer = get_analyzer()
+    rubric = analyzer.rubric.get()
+    sections = [name for name, _ in rubric.sections]
+    styles = rubric.style_names
+    corpus = build_corpus(analyzer, args.size, args.seed)
+    texts = [text for text in corpus for _ in GOALS]
+    goals = [goal for _ in corpus for goal in GOALS]
+
+    start = time.perf_counter()
+    expected = [
+        analyzer.score_text(normalize_answer(text), goal, rubric)
+        for text, goal in zip(texts, goals)
+    ]
+    per_answer_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = extract_features(texts, rubric)
+    extract_time = time.perf_counter() - start
+    goal_codes = encode_goals(goals, rubric)
+    result = score_matrix(features, goal_codes, rubric)
+
+    mismatches = 0
+    for i, scored in enumerate(expected):
+        breakdown = scored["scores"]["breakdown"]
+        actual = [int(result[section][i]) for section in sections]
+        wanted = [breakdown[section]["score"] for section in sections]
+        if (actual != wanted
+                or int(result["overall"][i]) != scored["overall_score"]
+                or styles[result["style"][i]] != scored["style"]):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"✗ Mismatch for {texts[i]!r} (goal={goals[i]})")
+                print(f"  per answer: {wanted} {scored['overall_score']} "
+                      f"{scored['style']}")
+                print(f"  vectorized: {actual} {int(result['overall'][i])} "
+                      f"{styles[result['style'][i]]}")
+
+    print(f"Checked {len(texts)} (answer, goal) pairs: {mismatches} mismatches")
+    print(f"score_text(): {per_answer_time * 1000:.0f} ms, "
+          f"extract_features(): {extract_time * 1000:.0f} ms")
+
+    repeats = -(-args.rows // len(texts))
+    big_features = np.tile(features, (repeats, 1))[:args.rows]
+    big_goals = np.tile(goal_codes, repeats)[:args.rows]
+    start = time.perf_counter()
+    score_matrix(big_features, big_goals, rubric)
+    matrix_time = time.perf_counter() - start
+    print(f"score_matrix() on {args.rows} rows: {matrix_time * 1000:.0f} ms "
+          f"({args.rows / matrix_time / 1e6:.1f}M rows/s)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
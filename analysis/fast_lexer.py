@@ -0,0 +1,370 @@
+"""
+fast_lexer.py - Pure-Python trie lexer built from SentenceLexer.g4
+
+The sentence vocabulary is a closed set of keywords and multi-word
+phrases plus a few character-class rules (WORD, NUMBER, PUNCT, WS).
+This module reads the grammar at startup, puts every literal into a
+character trie and matches the remaining rules with small greedy
+scanners. It reproduces the ANTLR lexer's behaviour:
+
+- Longest match wins; on a tie the rule defined first wins
+- `-> skip` rules (WS) produce no token
+- Unmatched input is reported as "token recognition error at: '...'"
+  with the same span and recovery as the ANTLR runtime
+
+No antlr4 import is needed. Use check_lexer_parity.py to verify it
+token-for-token against the generated SentenceLexer.
+"""
+
+import os
+import re
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GRAMMAR_PATH = os.path.join(BASE_DIR, "grammar", "SentenceLexer.g4")
+TOKENS_PATH = os.path.join(BASE_DIR, "generated", "SentenceLexer.tokens")
+
+EOF = -1
+
+_RULE_START_RE = re.compile(r"^([A-Z][A-Z_0-9]*)\s*:", re.M)
+_ELEMENT_RE = re.compile(r"'((?:\\.|[^'\\])*)'|\[((?:\\.|[^\]\\])*)\]|(\+)")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "\\": "\\", "'": "'", "]": "]"}
+
+
+# =====================================================
+# GRAMMAR LOADING
+# =====================================================
+def _unescape(body: str) -> str:
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+def _parse_charset(body: str) -> frozenset:
+    chars = _unescape(body)
+    result = set()
+    i = 0
+    while i < len(chars):
+        if i + 2 < len(chars) and chars[i + 1] == "-":
+            for code in range(ord(chars[i]), ord(chars[i + 2]) + 1):
+                result.add(chr(code))
+            i += 3
+        else:
+            result.add(chars[i])
+            i += 1
+    return frozenset(result)
+
+
+def _split_unquoted(source: str, pos: int, separators: str) -> tuple:
+    """
+    Scan from pos, splitting on separators outside quotes and brackets.
+    Stops at the first unquoted ';' and returns (pieces, end_position).
+    """
+    pieces, current = [], []
+    in_quote = in_set = False
+    i = pos
+    while i < len(source):
+        ch = source[i]
+        if ch == "\\" and (in_quote or in_set):
+            current.append(source[i:i + 2])
+            i += 2
+            continue
+        if ch == "'" and not in_set:
+            in_quote = not in_quote
+        elif ch == "[" and not in_quote:
+            in_set = True
+        elif ch == "]" and not in_quote:
+            in_set = False
+        elif not in_quote and not in_set:
+            if ch == ";":
+                break
+            if ch in separators:
+                pieces.append("".join(current))
+                current = []
+                i += 1
+                continue
+        current.append(ch)
+        i += 1
+    pieces.append("".join(current))
+    return pieces, i
+
+
+def load_lexer_rules(grammar_path: str = GRAMMAR_PATH) -> list:
+    """
+    Parse the lexer grammar into a list of rules:
+        (name, skip, literals, patterns)
+    where `patterns` are sequences of (charset, repeat) elements.
+    """
+    with open(grammar_path, encoding="utf-8") as f:
+        source = re.sub(r"//[^\n]*", "", f.read())
+
+    rules = []
+    pos = 0
+    while True:
+        match = _RULE_START_RE.search(source, pos)
+        if not match:
+            break
+        name = match.group(1)
+        alternatives, pos = _split_unquoted(source, match.end(), "|")
+
+        skip = False
+        if "->" in alternatives[-1]:
+            alternatives[-1], action = alternatives[-1].split("->", 1)
+            skip = action.strip() == "skip"
+
+        literals, patterns = [], []
+        for alt in alternatives:
+            elements = []
+            for literal, charset, plus in _ELEMENT_RE.findall(alt):
+                if plus:
+                    charset_, _ = elements[-1]
+                    elements[-1] = (charset_, True)
+                elif charset:
+                    elements.append((_parse_charset(charset), False))
+                else:
+                    for ch in _unescape(literal):
+                        elements.append((frozenset(ch), False))
+
+            if not elements:
+                continue  # empty alternative: never the longest match
+            if all(len(s) == 1 and not rep for s, rep in elements):
+                literals.append("".join(next(iter(s)) for s, _ in elements))
+            else:
+                _check_greedy(name, elements)
+                patterns.append(tuple(elements))
+
+        rules.append((name, skip, literals, patterns))
+    return rules
+
+
+def _check_greedy(name: str, elements: list):
+    # Greedy scanning equals ANTLR's longest match only when neighbouring
+    # elements cannot match the same character.
+    for (a, _), (b, _) in zip(elements, elements[1:]):
+        if a & b:
+            raise ValueError(f"Rule {name} is not supported by the fast lexer")
+
+
+def load_token_types(tokens_path: str = TOKENS_PATH) -> dict:
+    types = {}
+    with open(tokens_path, encoding="utf-8") as f:
+        for line in f:
+            name, _, value = line.strip().rpartition("=")
+            if name and not name.startswith("'"):
+                types[name] = int(value)
+    return types
+
+
+# =====================================================
+# LEXER
+# =====================================================
+class FastSentenceLexer:
+    """
+    Trie + greedy-scanner lexer with the same output as SentenceLexer.
+
+    tokenize() returns (tokens, errors):
+    - tokens: list of (type, start, stop, line, column) tuples,
+      ending with an EOF tuple like the ANTLR token stream
+    - errors: dicts in SentenceErrorListener format
+    """
+
+    def __init__(self, grammar_path: str = GRAMMAR_PATH,
+                 tokens_path: str = TOKENS_PATH):
+        types = load_token_types(tokens_path)
+        rules = load_lexer_rules(grammar_path)
+
+        self.symbolic_names = ["<INVALID>"] * (max(types.values()) + 1)
+        for name, value in types.items():
+            self.symbolic_names[value] = name
+
+        self._trie = {}
+        self._patterns = []
+        self._skip_types = set()
+
+        # Rule order is the ANTLR tie-breaker, so store it with each match
+        for priority, (name, skip, literals, patterns) in enumerate(rules):
+            token_type = types[name]
+            if skip:
+                self._skip_types.add(token_type)
+            for literal in literals:
+                node = self._trie
+                for ch in literal:
+                    node = node.setdefault(ch, {})
+                if None not in node or node[None][0] > priority:
+                    node[None] = (priority, token_type)
+            for elements in patterns:
+                self._patterns.append(
+                    (priority, token_type, elements, _compile(elements))
+                )
+
+        # Only the patterns that can start with a given character are tried
+        self._patterns_by_char = {}
+        for pattern in self._patterns:
+            for ch in pattern[2][0][0]:
+                self._patterns_by_char.setdefault(ch, []).append(pattern)
+
+        self._first_chars = frozenset(self._trie) | frozenset(
+            self._patterns_by_char
+        )
+
+    def tokenize(self, text: str) -> tuple:
+        # Same loop as iter_spans(), inlined: this is the hot path
+        tokens, errors = [], []
+        n = len(text)
+        pos, line, column = 0, 1, 0
+
+        while pos < n:
+            length, token_type, reach = self._match(text, pos, n)
+
+            if length:
+                end = pos + length
+                if token_type not in self._skip_types:
+                    tokens.append((token_type, pos, end - 1, line, column))
+            else:
+                # Same span and recovery as Lexer.notifyListeners/recover
+                end = min(pos + reach + 1, n)
+                errors.append(error_from_span(text, pos, end, line, column))
+
+            newlines = text.count("\n", pos, end)
+            if newlines:
+                line += newlines
+                column = end - text.rfind("\n", pos, end) - 1
+            else:
+                column += end - pos
+            pos = end
+
+        tokens.append((EOF, pos, pos - 1, line, column))
+        return tokens, errors
+
+    def iter_spans(self, text: str, pos: int = 0, line: int = 1,
+                   column: int = 0):
+        """
+        Yield every match from pos on as
+            (token_type, start, end, line, column, lookahead)
+        with end exclusive. Skipped tokens are included; an error span
+        has token_type None. lookahead is the furthest index the match
+        examined (len(text) means it ran into the end of the input).
+
+        Matching at a position depends only on the text from there on,
+        so a caller can resume at any span boundary (incremental_lexer.py).
+        """
+        n = len(text)
+        while pos < n:
+            length, token_type, reach = self._match(text, pos, n)
+
+            if length:
+                end = pos + length
+            else:
+                end = min(pos + reach + 1, n)
+                token_type = None
+
+            # A pattern may read past the winning match before failing
+            lookahead = max(pos + reach, end)
+            for _, _, elements, _ in self._patterns_by_char.get(text[pos], ()):
+                lookahead = max(lookahead, pos + _scan(elements, text, pos, n))
+
+            yield token_type, pos, end, line, column, lookahead
+
+            line, column = advance(text, pos, end, line, column)
+            pos = end
+
+    def is_skipped(self, token_type: int) -> bool:
+        return token_type in self._skip_types
+
+    def _match(self, text: str, pos: int, n: int) -> tuple:
+        """Return (length, token_type, reach) of the best match at pos."""
+        if text[pos] not in self._first_chars:
+            return 0, None, 0
+
+        best_len, best_priority, best_type = 0, None, None
+
+        # ---- literals: walk the trie ----
+        node = self._trie
+        i = pos
+        while i < n:
+            node = node.get(text[i])
+            if node is None:
+                break
+            i += 1
+            if None in node:
+                priority, token_type = node[None]
+                best_len, best_priority, best_type = i - pos, priority, token_type
+        reach = i - pos
+
+        # ---- character-class rules ----
+        patterns = self._patterns_by_char.get(text[pos], ())
+        for priority, token_type, _, match in patterns:
+            m = match(text, pos)
+            if m is None:
+                continue
+            length = m.end() - pos
+            if length > best_len or (
+                length == best_len and priority < best_priority
+            ):
+                best_len, best_priority, best_type = length, priority, token_type
+
+        # Only an unmatched position needs to know how far scanning got
+        if not best_len:
+            for _, _, elements, _ in patterns:
+                reach = max(reach, _scan(elements, text, pos, n))
+
+        return best_len, best_type, reach
+
+
+def _compile(elements: tuple):
+    """Compile a (charset, repeat) sequence into a regex match function."""
+    regex = "".join(
+        "[" + "".join(re.escape(ch) for ch in sorted(charset)) + "]"
+        + ("+" if repeat else "")
+        for charset, repeat in elements
+    )
+    return re.compile(regex).match
+
+
+def _scan(elements: tuple, text: str, pos: int, n: int) -> int:
+    """Characters a greedy (charset, repeat) sequence consumes at pos."""
+    i = pos
+    for charset, repeat in elements:
+        if i >= n or text[i] not in charset:
+            break
+        i += 1
+        if repeat:
+            while i < n and text[i] in charset:
+                i += 1
+    return i - pos
+
+
+def advance(text: str, start: int, end: int, line: int, column: int) -> tuple:
+    """(line, column) after consuming text[start:end] from (line, column)."""
+    newlines = text.count("\n", start, end)
+    if newlines:
+        return line + newlines, end - text.rfind("\n", start, end) - 1
+    return line, column + end - start
+
+
+def error_from_span(text: str, start: int, end: int, line: int,
+                    column: int) -> dict:
+    """Error dict (SentenceErrorListener format) for an unmatched span."""
+    return {
+        "line": line,
+        "column": column,
+        "message": "token recognition error at: '"
+                   + _error_display(text[start:end]) + "'",
+        "symbol": "None"
+    }
+
+
+def _error_display(s: str) -> str:
+    return s.replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r")
+
+
+_lexer = None
+_lexer_lock = threading.Lock()
+
+
+def get_fast_lexer() -> FastSentenceLexer:
+    """Shared instance; the lexer is stateless after construction."""
+    global _lexer
+    if _lexer is None:
+        with _lexer_lock:
+            if _lexer is None:
+                _lexer = FastSentenceLexer()
+    return _lexer
@@ -0,0 +1,94 @@
+"""
+feature_extractor.py - Phrase-level features from the SentenceParser tree
+
+Walks the parse tree ONCE with a SentenceParserVisitor and counts the
+phrases the grammar recognises (apologies, requests, softeners, strong
+expressions, ...). Complements the analyzer's keyword rubric with what
+the grammar knows about sentence structure.
+"""
+
+from analysis.generated.SentenceLexer import SentenceLexer
+from analysis.generated.SentenceParser import SentenceParser
+from analysis.generated.SentenceParserVisitor import SentenceParserVisitor
+from analysis.parser_runner import run_sentence
+
+SOFTENER_TOKENS = frozenset([SentenceLexer.SOFT_WORD, SentenceLexer.HEDGE_WORD])
+
+FEATURE_NAMES = (
+    "apology_phrases",
+    "request_phrases",
+    "softeners",
+    "strong_expressions",
+    "polite_phrases",
+    "question_phrases",
+    "emotional_expressions",
+    "has_greeting",
+    "has_closing",
+)
+
+
+class SentenceFeatureVisitor(SentenceParserVisitor):
+    """
+    Count phrase-level features in a single walk of the parse tree.
+
+    Softeners are counted per SOFT_WORD/HEDGE_WORD token, wherever the
+    parser attached them (polite_phrase, softener or polite_closing),
+    because the element alternatives overlap. Tokens the parser skipped
+    during error recovery (error nodes) are not counted.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.features = dict.fromkeys(FEATURE_NAMES, 0)
+
+    def _count(self, name: str, ctx):
+        self.features[name] += 1
+        return self.visitChildren(ctx)
+
+    def visitGreeting(self, ctx: SentenceParser.GreetingContext):
+        self.features["has_greeting"] = 1
+        return self.visitChildren(ctx)
+
+    def visitClosing(self, ctx: SentenceParser.ClosingContext):
+        self.features["has_closing"] = 1
+        return self.visitChildren(ctx)
+
+    def visitPolite_closing(self, ctx: SentenceParser.Polite_closingContext):
+        if ctx.APOLOGY_WORD() is not None:
+            self.features["apology_phrases"] += 1
+        return self.visitChildren(ctx)
+
+    def visitPolite_phrase(self, ctx: SentenceParser.Polite_phraseContext):
+        return self._count("polite_phrases", ctx)
+
+    def visitApology_phrase(self, ctx: SentenceParser.Apology_phraseContext):
+        return self._count("apology_phrases", ctx)
+
+    def visitRequest_phrase(self, ctx: SentenceParser.Request_phraseContext):
+        return self._count("request_phrases", ctx)
+
+    def visitEmotional_expression(self, ctx: SentenceParser.Emotional_expressionContext):
+        return self._count("emotional_expressions", ctx)
+
+    def visitQuestion_phrase(self, ctx: SentenceParser.Question_phraseContext):
+        return self._count("question_phrases", ctx)
+
+    def visitStrong_expression(self, ctx: SentenceParser.Strong_expressionContext):
+        return self._count("strong_expressions", ctx)
+
+    def visitTerminal(self, node):
+        if node.getSymbol().type in SOFTENER_TOKENS:
+            self.features["softeners"] += 1
+
+
+def extract_features_from_tree(tree) -> dict:
+    """Feature counts for an existing SentenceContext (or None)."""
+    visitor = SentenceFeatureVisitor()
+    if tree is not None:
+        visitor.visit(tree)
+    return visitor.features
+
+
+def extract_features(text: str) -> dict:
+    """Parse the text in tree mode and return its phrase features."""
+    return extract_features_from_tree(run_sentence(text, mode="tree").tree)
@@ -0,0 +1,31 @@
+"""
+frozen.py - Read-only containers for shared tables and cached results
+
+Objects that are shared between requests and threads (engine lookup
+tables, cached analysis results) are deep-frozen: dicts become
+FrozenDict, lists become tuples. A caller that tries to modify one
+gets a TypeError instead of silently changing it for everybody.
+"""
+
+
+class FrozenDict(dict):
+    """A dict that raises on mutation (still JSON-serializable)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared tables and cached results are read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    """Deep copy of value with every dict and list made read-only."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
@@ -17,6 +17,7 @@ SOFT_WORD
     | 'perhaps' | 'possibly' | 'kindly' | 'gently' | 'hopefully'
     | 'wondering' | 'consider' | 'suggest' | 'feel'
     | 'would you mind' | 'if you could' | 'when you get a chance'
+    | 'could' | 'might'
     ;
 
 // ===== Polite softeners and hedge words =====
@@ -30,7 +31,7 @@ STRONG_WORD
     : 'wrong' | 'bad' | 'careless' | 'always' | 'stupid'
     | 'terrible' | 'awful' | 'horrible' | 'hate' | 'dumb'
     | 'idiot' | 'fool' | 'ugly' | 'worst' | 'useless'
-    | 'annoying' | 'boring' | 'gross' | 'weird'
+    | 'annoying' | 'boring' | 'gross' | 'weird' | 'never'
     ;
 
 // ===== Command / demanding words =====
@@ -107,7 +108,7 @@ QUESTION_WORD
 TIME_WORD
     : 'today' | 'tomorrow' | 'yesterday' | 'now' | 'later'
     | 'soon' | 'before' | 'after' | 'always' |
-    | 'sometimes' | 'often' | 'usually'
+    | 'sometimes' | 'often' | 'usually' | 'never'
     ;
 
 // ===== Conjunctions =====
@@ -152,7 +153,7 @@ COMMON_VERB
     | 'have' | 'has' | 'had' | 'do' | 'does' | 'did'
     | 'make' | 'made' | 'go' | 'went' | 'come' | 'came'
     | 'take' | 'took' | 'give' | 'gave' | 'get' | 'got'
-    | 'see' | 'saw' | 'know' | 'knew' | 'thought'
+    | 'see' | 'saw' | 'know' | 'knew' | 'think' | 'thought'
     | 'say' | 'said' | 'tell' | 'told'
     ;
 
@@ -0,0 +1,175 @@
+"""
+incremental_lexer.py - Re-lex only the edited part of a growing answer
+
+Used by the live as-you-type meter. Each session keeps the spans
+(tokens, skipped whitespace and error spans) of its previous text. On
+an update:
+
+1. The common prefix and suffix of the old and new text give the
+   edited region
+2. Spans that never looked at the edited region are kept as they are
+3. The fast lexer resumes at the first affected span
+4. As soon as it reaches an old span boundary past the edit, the rest
+   of the old spans are reused, shifted by the length difference
+
+The fast lexer is context-free (a match depends only on the text from
+its start on), so the result equals a full FastSentenceLexer.tokenize().
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+from analysis.fast_lexer import EOF, advance, error_from_span, get_fast_lexer
+
+
+class IncrementalLexer:
+    """
+    Lexer state for ONE text being edited. update() is serialized with
+    a lock, so concurrent requests from the same session are safe.
+    """
+
+    def __init__(self, lexer=None):
+        self.lexer = lexer or get_fast_lexer()
+        self.text = ""
+        # FastSentenceLexer.iter_spans() tuples; type None = error span
+        self.spans = []
+        # Start index of each span, for bisect (parallel to spans)
+        self._starts = []
+        self._lookahead_max = []
+        # Work done by the last update(), for diagnostics
+        self.relexed = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def update(self, text: str) -> tuple:
+        """
+        Lex the new text, reusing the previous pass where possible.
+        Returns (tokens, errors) in FastSentenceLexer.tokenize() format.
+        """
+        with self._lock:
+            if text != self.text:
+                self._relex(text)
+            else:
+                self.relexed, self.reused = 0, len(self.spans)
+            return self._tokens_and_errors(self.text, self.spans)
+
+    def _relex(self, text: str):
+        old, spans, starts = self.text, self.spans, self._starts
+
+        prefix = len(os.path.commonprefix([old, text]))
+        max_suffix = min(len(old), len(text)) - prefix
+        suffix = len(os.path.commonprefix(
+            [old[::-1][:max_suffix], text[::-1][:max_suffix]]
+        ))
+        edit_start = prefix
+        new_edit_end = len(text) - suffix
+        delta = len(text) - len(old)
+
+        # Keep the spans that finished reading before the edit:
+        # _lookahead_max[i] is the furthest index spans[:i + 1] read
+        keep = bisect_left(self._lookahead_max, edit_start)
+
+        new_spans = spans[:keep]
+        if new_spans:
+            _, start, end, line, column, _ = new_spans[-1]
+            pos = end
+            line, column = advance(old, start, end, line, column)
+        else:
+            pos, line, column = 0, 1, 0
+
+        relexed = reused = 0
+        for span in self.lexer.iter_spans(text, pos, line, column):
+            start = span[1]
+            if start >= new_edit_end:
+                # An old span boundary past the edit: the rest matches
+                index = bisect_left(starts, start - delta)
+                if index < len(spans) and spans[index][1] == start - delta:
+                    reused = self._append_shifted(
+                        new_spans, spans[index:], span, delta
+                    )
+                    break
+            new_spans.append(span)
+            relexed += 1
+
+        new_starts = starts[:keep]
+        new_starts.extend(span[1] for span in new_spans[keep:])
+
+        lookahead_max = self._lookahead_max[:keep]
+        furthest = lookahead_max[-1] if lookahead_max else -1
+        for span in new_spans[keep:]:
+            furthest = max(furthest, span[5])
+            lookahead_max.append(furthest)
+
+        self.text = text
+        self.spans = new_spans
+        self._starts = new_starts
+        self._lookahead_max = lookahead_max
+        self.relexed = relexed
+        self.reused = keep + reused
+
+    @staticmethod
+    def _append_shifted(new_spans: list, old_tail: list, sync_span: tuple,
+                        delta: int) -> int:
+        """Reuse old_tail, moved to where sync_span starts in the new text."""
+        sync_line, sync_column = old_tail[0][3], old_tail[0][4]
+        line_shift = sync_span[3] - sync_line
+        column_shift = sync_span[4] - sync_column
+
+        for token_type, start, end, line, column, lookahead in old_tail:
+            # Columns only move on the line where the edit ended
+            if line == sync_line:
+                column += column_shift
+            new_spans.append((token_type, start + delta, end + delta,
+                              line + line_shift, column, lookahead + delta))
+        return len(old_tail)
+
+    def _tokens_and_errors(self, text: str, spans: list) -> tuple:
+        is_skipped = self.lexer.is_skipped
+        tokens = [
+            (span[0], span[1], span[2] - 1, span[3], span[4])
+            for span in spans
+            if span[0] is not None and not is_skipped(span[0])
+        ]
+        errors = [
+            error_from_span(text, *span[1:5])
+            for span in spans if span[0] is None
+        ]
+
+        if spans:
+            _, start, end, line, column, _ = spans[-1]
+            line, column = advance(text, start, end, line, column)
+            pos = end
+        else:
+            pos, line, column = 0, 1, 0
+        tokens.append((EOF, pos, pos - 1, line, column))
+        return tokens, errors
+
+
+class IncrementalLexerPool:
+    """
+    Per-session IncrementalLexers, least recently used evicted first.
+    Lives in process memory: a session that lands on another worker
+    simply starts with a full lex.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._lexers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> IncrementalLexer:
+        with self._lock:
+            lexer = self._lexers.get(key)
+            if lexer is None:
+                lexer = IncrementalLexer()
+                self._lexers[key] = lexer
+                while len(self._lexers) > self.maxsize:
+                    self._lexers.popitem(last=False)
+            else:
+                self._lexers.move_to_end(key)
+            return lexer
+
+
+live_lexers = IncrementalLexerPool()
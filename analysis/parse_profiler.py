@@ -0,0 +1,178 @@
+"""
+parse_profiler.py - Per-decision profiling of SentenceParser prediction
+
+The Python ANTLR runtime has no ProfilingATNSimulator (it only ships
+with the Java runtime), so this module ports the parts we need:
+ProfilingParserATNSimulator replaces a parser's _interp and records,
+for every grammar decision:
+
+- invocations and time spent in adaptivePredict()
+- SLL / LL lookahead depth (tokens examined to decide)
+- DFA hits vs ATN simulation steps (cache misses)
+- LL fallbacks, context sensitivities, ambiguities and errors
+
+Use SentencePipeline(profile=True) or parser_runner.profile_sentences();
+profile_parser.py turns the numbers into a report.
+"""
+
+import time
+
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.dfa.DFA import DFA
+from antlr4.PredictionContext import PredictionContextCache
+
+DECISION_FIELDS = (
+    "invocations",
+    "time_ns",
+    "sll_total_look",
+    "sll_min_look",
+    "sll_max_look",
+    "ll_total_look",
+    "ll_min_look",
+    "ll_max_look",
+    "sll_dfa_transitions",
+    "sll_atn_transitions",
+    "ll_atn_transitions",
+    "ll_fallbacks",
+    "context_sensitivities",
+    "ambiguities",
+    "errors",
+)
+
+
+class DecisionInfo:
+    """Counters for one decision (mirrors the Java runtime's DecisionInfo)."""
+
+    __slots__ = ("decision",) + DECISION_FIELDS
+
+    def __init__(self, decision: int):
+        self.decision = decision
+        for field in DECISION_FIELDS:
+            setattr(self, field, 0)
+        self.sll_min_look = self.ll_min_look = None
+
+    def as_dict(self) -> dict:
+        data = {"decision": self.decision}
+        data.update((field, getattr(self, field)) for field in DECISION_FIELDS)
+        return data
+
+
+class ProfilingParserATNSimulator(ParserATNSimulator):
+    """
+    ParserATNSimulator that counts what each decision costs.
+
+    By default it gets its own, empty DFA so the numbers do not depend
+    on what the process parsed before (cold-start cost). Pass the
+    parser's shared decisionsToDFA to profile the warm steady state.
+    """
+
+    def __init__(self, parser, decisions_to_dfa: list = None):
+        atn = parser.atn
+        if decisions_to_dfa is None:
+            decisions_to_dfa = [
+                DFA(state, i) for i, state in enumerate(atn.decisionToState)
+            ]
+        super().__init__(parser, atn, decisions_to_dfa,
+                         PredictionContextCache())
+
+        self.decisions = [
+            DecisionInfo(i) for i in range(len(atn.decisionToState))
+        ]
+        self._current_decision = -1
+        self._sll_stop_index = -1
+        self._ll_stop_index = -1
+
+    # =====================================================
+    # INSTRUMENTED OVERRIDES
+    # =====================================================
+    def adaptivePredict(self, input, decision: int, outerContext):
+        self._current_decision = decision
+        self._sll_stop_index = -1
+        self._ll_stop_index = -1
+        start_index = input.index
+
+        started = time.perf_counter_ns()
+        try:
+            return super().adaptivePredict(input, decision, outerContext)
+        finally:
+            info = self.decisions[decision]
+            info.time_ns += time.perf_counter_ns() - started
+            info.invocations += 1
+
+            if self._sll_stop_index >= 0:
+                look = self._sll_stop_index - start_index + 1
+                info.sll_total_look += look
+                info.sll_min_look = _min(info.sll_min_look, look)
+                info.sll_max_look = max(info.sll_max_look, look)
+
+            if self._ll_stop_index >= 0:
+                look = self._ll_stop_index - start_index + 1
+                info.ll_total_look += look
+                info.ll_min_look = _min(info.ll_min_look, look)
+                info.ll_max_look = max(info.ll_max_look, look)
+
+            self._current_decision = -1
+
+    def getExistingTargetState(self, previousD, t: int):
+        # Called once per SLL lookahead token
+        self._sll_stop_index = self._input.index
+        existing = super().getExistingTargetState(previousD, t)
+        if existing is not None:
+            info = self.decisions[self._current_decision]
+            info.sll_dfa_transitions += 1
+            if existing is self.ERROR:
+                info.errors += 1
+        return existing
+
+    def computeTargetState(self, dfa, previousD, t: int):
+        state = super().computeTargetState(dfa, previousD, t)
+        info = self.decisions[self._current_decision]
+        info.sll_atn_transitions += 1
+        if state is self.ERROR:
+            info.errors += 1
+        return state
+
+    def computeReachSet(self, closure, t: int, fullCtx: bool):
+        if fullCtx:
+            # Full-context steps are never cached in the DFA
+            self._ll_stop_index = self._input.index
+            self.decisions[self._current_decision].ll_atn_transitions += 1
+        return super().computeReachSet(closure, t, fullCtx)
+
+    def reportAttemptingFullContext(self, dfa, conflictingAlts, configs,
+                                    startIndex: int, stopIndex: int):
+        self.decisions[dfa.decision].ll_fallbacks += 1
+        super().reportAttemptingFullContext(
+            dfa, conflictingAlts, configs, startIndex, stopIndex
+        )
+
+    def reportContextSensitivity(self, dfa, prediction: int, configs,
+                                 startIndex: int, stopIndex: int):
+        self.decisions[dfa.decision].context_sensitivities += 1
+        super().reportContextSensitivity(
+            dfa, prediction, configs, startIndex, stopIndex
+        )
+
+    def reportAmbiguity(self, dfa, D, startIndex: int, stopIndex: int,
+                        exact: bool, ambigAlts, configs):
+        self.decisions[dfa.decision].ambiguities += 1
+        super().reportAmbiguity(
+            dfa, D, startIndex, stopIndex, exact, ambigAlts, configs
+        )
+
+    # =====================================================
+    # RESULTS
+    # =====================================================
+    def describe_decision(self, decision: int) -> str:
+        """Rule name and ATN state of a decision, e.g. 'sentence (s12)'."""
+        state = self.atn.decisionToState[decision]
+        rule = self.parser.ruleNames[state.ruleIndex]
+        return f"{rule} (s{state.stateNumber})"
+
+    def reset_counters(self):
+        for info in self.decisions:
+            info.__init__(info.decision)
+
+
+def _min(current, value: int) -> int:
+    return value if current is None else min(current, value)
@@ -1,7 +1,34 @@
+import threading
+
 from antlr4 import InputStream, CommonTokenStream
+from antlr4.ListTokenSource import ListTokenSource
+from antlr4.Token import CommonToken
+from antlr4.atn.PredictionMode import PredictionMode
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+from analysis.fast_lexer import get_fast_lexer
 from analysis.generated.SentenceLexer import SentenceLexer
 from analysis.generated.SentenceParser import SentenceParser
+from analysis.token_buffer import TokenBuffer
+from config import Config
+
+# Lexer backends for run_sentence():
+# - "antlr":  generated SentenceLexer (reference implementation)
+# - "fast":   trie lexer from analysis/fast_lexer.py
+# - "parity": ANTLR result, cross-checked against the fast lexer
+LEXER_BACKENDS = ("antlr", "fast", "parity")
+
+# Parser prediction strategies:
+# - "sll_first": SLL + bail-out first, full LL only if SLL fails
+# - "ll":        always full LL (the ANTLR default)
+PREDICTION_STRATEGIES = ("sll_first", "ll")
+
+# How much work run_sentence() does:
+# - "lex":      tokens and lexical errors only, the parser never runs
+# - "validate": also parse for syntax errors, without building a tree
+# - "tree":     also keep the parse tree on the result
+PARSE_MODES = ("lex", "validate", "tree")
 
 
 class SentenceErrorListener(ErrorListener):
@@ -22,6 +49,308 @@ class SentenceErrorListener(ErrorListener):
         })
 
 
+class SentencePipeline:
+    """
+    A reusable lexer + token stream + parser + error listener.
+
+    Building SentenceLexer/SentenceParser is costly in the Python
+    runtime (ATN simulators, listeners, error strategy), so each worker
+    thread builds them once and resets them between calls.
+    Instances are NOT thread-safe; use get_pipeline().
+    """
+
+    def __init__(self, profile: bool = False):
+        # The shared DFAs are only ever replaced before this point
+        install_dfa_cache()
+
+        self.error_listener = SentenceErrorListener()
+
+        self.lexer = SentenceLexer(InputStream(""))
+        self.lexer.removeErrorListeners()
+        self.lexer.addErrorListener(self.error_listener)
+
+        self.token_stream = CommonTokenStream(self.lexer)
+
+        self.parser = SentenceParser(self.token_stream)
+        self.parser.removeErrorListeners()
+        self.parser.addErrorListener(self.error_listener)
+
+        # profile=True: per-decision counters on a private, cold DFA
+        # (see parse_profiler.py); never used for normal requests
+        self.profiler = None
+        if profile:
+            from analysis.parse_profiler import ProfilingParserATNSimulator
+            self.profiler = ProfilingParserATNSimulator(self.parser)
+            self.parser._interp = self.profiler
+
+    def lex(self, text: str) -> CommonTokenStream:
+        """Reset the lexer onto new text and return the filled stream."""
+        # Fresh list: results from the previous call keep their own errors
+        self.error_listener.errors = []
+
+        # The setter calls lexer.reset() (mode, line/column, DFA state)
+        self.lexer.inputStream = InputStream(text)
+        self.token_stream.setTokenSource(self.lexer)
+        self.token_stream.fill()
+        return self.token_stream
+
+    def stream_from(self, raw_tokens: list, text: str,
+                    errors: list) -> CommonTokenStream:
+        """
+        Wrap (type, start, stop, line, column) tuples from another lexer
+        in a token stream the parser can consume.
+        """
+        self.error_listener.errors = errors
+
+        tokens = []
+        for token_type, start, stop, line, column in raw_tokens:
+            token = CommonToken(type=token_type, start=start, stop=stop)
+            token.line = line
+            token.column = column
+            token.text = text[start:stop + 1] if token_type != -1 else "<EOF>"
+            tokens.append(token)
+
+        token_stream = CommonTokenStream(ListTokenSource(tokens))
+        token_stream.fill()
+        return token_stream
+
+    def parse(self, token_stream: CommonTokenStream = None,
+              prediction: str = "sll_first",
+              build_tree: bool = True) -> tuple:
+        """
+        Parse a token stream (default: the lexer's) from the start.
+
+        Returns (tree, path) where path is "sll" or "ll": the stage
+        that produced the tree. With build_tree=False the returned
+        context has no children (syntax checking only).
+        """
+        token_stream = token_stream or self.token_stream
+        parser = self.parser
+        parser.buildParseTrees = build_tree
+
+        if prediction == "sll_first":
+            # Stage 1: cheap SLL prediction, give up on the first error.
+            # Listeners are detached so a bail-out reports nothing.
+            parser.setTokenStream(token_stream)
+            parser._interp.predictionMode = PredictionMode.SLL
+            parser._errHandler = BailErrorStrategy()
+            parser.removeErrorListeners()
+            try:
+                return parser.sentence(), "sll"
+            except ParseCancellationException:
+                pass
+            finally:
+                parser.addErrorListener(self.error_listener)
+
+        # Stage 2: full LL with normal error reporting and recovery.
+        # setTokenStream() resets the parser but does not rewind the
+        # stream, and stage 1 may have consumed part of it.
+        token_stream.seek(0)
+        parser.setTokenStream(token_stream)
+        parser._interp.predictionMode = PredictionMode.LL
+        parser._errHandler = DefaultErrorStrategy()
+        return parser.sentence(), "ll"
+
+
+# Cached DFA states are installed once per process, before the first
+# pipeline is built, so they are never swapped under a running parse
+_dfa_cache_lock = threading.Lock()
+_dfa_cache_loaded = None    # None: not attempted yet
+
+
+def install_dfa_cache(path: str = None) -> bool:
+    """
+    Load the on-disk DFA cache (warmup.py) into the shared lexer and
+    parser DFAs, once per process. The first call decides: later calls
+    (and other paths) just return whether it was loaded. path defaults
+    to Config.ANTLR_DFA_CACHE ("" disables it).
+    """
+    global _dfa_cache_loaded
+    if _dfa_cache_loaded is None:
+        with _dfa_cache_lock:
+            if _dfa_cache_loaded is None:
+                path = Config.ANTLR_DFA_CACHE if path is None else path
+                loaded = False
+                if path:
+                    # warmup.py imports this module
+                    from analysis.warmup import load_dfa_cache
+                    loaded = load_dfa_cache(path)
+                _dfa_cache_loaded = loaded
+    return _dfa_cache_loaded
+
+
+_pool = threading.local()
+
+
+def get_pipeline() -> SentencePipeline:
+    """Return this thread's pipeline, creating it on first use."""
+    pipeline = getattr(_pool, "pipeline", None)
+    if pipeline is None:
+        pipeline = SentencePipeline()
+        _pool.pipeline = pipeline
+    return pipeline
+
+
+def profile_sentences(texts, prediction: str = None) -> tuple:
+    """
+    Parse every text on a profiling pipeline (validate mode).
+
+    Returns (profiler, stage_counts): the ProfilingParserATNSimulator
+    with per-decision counters, and how many parses finished in the
+    "sll" and "ll" stages.
+    """
+    prediction = prediction or Config.PARSE_PREDICTION
+    if prediction not in PREDICTION_STRATEGIES:
+        raise ValueError(f"Unknown prediction strategy: {prediction}")
+
+    pipeline = SentencePipeline(profile=True)
+    stage_counts = {"sll": 0, "ll": 0}
+
+    for text in texts:
+        if not text.strip():
+            continue
+        token_stream = pipeline.lex(text.lower())
+        try:
+            _, path = pipeline.parse(token_stream, prediction, build_tree=False)
+            stage_counts[path] += 1
+        except Exception as e:
+            print(f"Error profiling {text!r}: {e}")
+
+    return pipeline.profiler, stage_counts
+
+
+class SentenceParseResult:
+    """
+    Everything produced by one lexer + parser pass over a sentence:
+    the compact token buffer and lexical/syntax errors. Token names
+    and per-token dicts are built on demand.
+    """
+
+    def __init__(self, buffer: TokenBuffer, errors: list,
+                 parse_path: str = None, tree=None):
+        self.buffer = buffer
+        self.errors = errors
+        # "sll", "ll", or None when the parser did not run
+        self.parse_path = parse_path
+        # SentenceParser.SentenceContext, only in "tree" mode
+        self.tree = tree
+
+    @property
+    def tokens(self) -> list:
+        """Token type names (a new list per access)."""
+        return self.buffer.names()
+
+    @property
+    def token_details(self) -> TokenBuffer:
+        """Per-token dicts, as a read-only sequence."""
+        return self.buffer
+
+    @property
+    def is_valid(self) -> bool:
+        return len(self.errors) == 0
+
+
+# Which parser stage produced each tree (see get_parse_stats)
+_parse_stats = {"sll": 0, "ll": 0}
+_stats_lock = threading.Lock()
+
+
+def get_parse_stats() -> dict:
+    """
+    Process-wide counts of SLL hits and LL fallbacks (served at
+    /metrics). Only parsing callers add to them - "validate"/"tree"
+    modes, such as analyze_sentence_structure() and the DFA warm-up.
+    The analyzer's hot path lexes only (mode="lex") and never does.
+    """
+    with _stats_lock:
+        stats = dict(_parse_stats)
+    total = stats["sll"] + stats["ll"]
+    stats["total"] = total
+    stats["sll_hit_rate"] = stats["sll"] / total if total else None
+    return stats
+
+
+def run_sentence(text: str, mode: str = "validate", backend: str = None,
+                 prediction: str = None) -> SentenceParseResult:
+    """
+    Lex the input text ONCE and (optionally) parse the same token stream.
+
+    Args:
+        text: Input sentence to be analyzed
+        mode: "lex", "validate" or "tree" (see PARSE_MODES); "lex" only
+              reports lexical errors
+        backend: "antlr", "fast" or "parity" (default: Config.LEXER_BACKEND)
+        prediction: "sll_first" or "ll" (default: Config.PARSE_PREDICTION)
+
+    Returns:
+        A SentenceParseResult with token names, token details and errors
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode: {mode}")
+
+    if not text.strip():
+        return SentenceParseResult(TokenBuffer(text.lower()), [])
+
+    backend = backend or Config.LEXER_BACKEND
+    if backend not in LEXER_BACKENDS:
+        raise ValueError(f"Unknown lexer backend: {backend}")
+
+    prediction = prediction or Config.PARSE_PREDICTION
+    if prediction not in PREDICTION_STRATEGIES:
+        raise ValueError(f"Unknown prediction strategy: {prediction}")
+
+    pipeline = get_pipeline()
+
+    # Lex the unstripped text so positions match the caller's string;
+    # surrounding whitespace is skipped by the WS rule anyway.
+    lowered = text.lower()
+
+    if backend == "fast":
+        raw_tokens, errors = get_fast_lexer().tokenize(lowered)
+        token_stream = None
+    else:
+        token_stream = pipeline.lex(lowered)
+        raw_tokens = [
+            (t.type, t.start, t.stop, t.line, t.column)
+            for t in token_stream.tokens
+        ]
+        errors = pipeline.error_listener.errors
+        if backend == "parity":
+            _check_parity(lowered, raw_tokens, errors)
+
+    buffer = TokenBuffer.from_raw(raw_tokens, lowered)
+
+    parse_path = None
+    tree = None
+    if mode != "lex":
+        if token_stream is None:
+            token_stream = pipeline.stream_from(raw_tokens, lowered, errors)
+        try:
+            tree, parse_path = pipeline.parse(
+                token_stream, prediction, build_tree=(mode == "tree")
+            )
+            if mode != "tree":
+                tree = None
+            with _stats_lock:
+                _parse_stats[parse_path] += 1
+        except Exception as e:
+            errors.append({
+                "line": 0,
+                "column": 0,
+                "message": str(e),
+                "symbol": "N/A"
+            })
+
+    return SentenceParseResult(buffer, errors, parse_path, tree)
+
+
+def _check_parity(text: str, raw_tokens: list, errors: list):
+    """Report any difference between the ANTLR and fast lexers."""
+    fast_tokens, fast_errors = get_fast_lexer().tokenize(text)
+    if fast_tokens != raw_tokens or fast_errors != errors:
+        print(f"Lexer parity mismatch: {text!r}")
+
+
 def parse_sentence(text: str, return_errors: bool = False):
     """
     Run ANTLR lexer and parser on the input text.
@@ -34,45 +363,12 @@ def parse_sentence(text: str, return_errors: bool = False):
         A list of token type names,
         or (tokens, errors) if return_errors is True
     """
-    text = text.strip()
-    if not text:
-        return [] if not return_errors else ([], [])
-
-    input_stream = InputStream(text.lower())
-    lexer = SentenceLexer(input_stream)
-
-    error_listener = SentenceErrorListener()
-    lexer.removeErrorListeners()
-    lexer.addErrorListener(error_listener)
-
-    token_stream = CommonTokenStream(lexer)
-    token_stream.fill()
-
-    tokens = []
-    for token in token_stream.tokens:
-        if token.type != -1:  # Skip EOF
-            token_name = lexer.symbolicNames[token.type]
-            if token_name:
-                tokens.append(token_name)
-
-    parser = SentenceParser(token_stream)
-    parser.removeErrorListeners()
-    parser.addErrorListener(error_listener)
-
-    try:
-        parser.sentence()
-    except Exception as e:
-        error_listener.errors.append({
-            "line": 0,
-            "column": 0,
-            "message": str(e),
-            "symbol": "N/A"
-        })
+    result = run_sentence(text)
 
     if return_errors:
-        return tokens, error_listener.errors
+        return result.tokens, result.errors
 
-    return tokens
+    return result.tokens
 
 
 def get_token_details(text: str) -> list:
@@ -80,26 +376,7 @@ def get_token_details(text: str) -> list:
     Retrieve detailed information for each token,
     including its type, text, and position.
     """
-    input_stream = InputStream(text.lower())
-    lexer = SentenceLexer(input_stream)
-    token_stream = CommonTokenStream(lexer)
-    token_stream.fill()
-
-    token_details = []
-    for token in token_stream.tokens:
-        if token.type != -1:  # Skip EOF
-            token_name = lexer.symbolicNames[token.type]
-            if token_name:
-                token_details.append({
-                    "type": token_name,
-                    "text": token.text,
-                    "start": token.start,
-                    "stop": token.stop,
-                    "line": token.line,
-                    "column": token.column
-                })
-
-    return token_details
+    return run_sentence(text, mode="lex").buffer.to_list()
 
 
 def analyze_sentence_structure(text: str) -> dict:
@@ -109,22 +386,27 @@ def analyze_sentence_structure(text: str) -> dict:
     Returns:
         A dictionary containing structural and syntactic information.
     """
-    tokens, errors = parse_sentence(text, return_errors=True)
-    token_details = get_token_details(text)
+    # feature_extractor imports this module
+    from analysis.feature_extractor import extract_features_from_tree
+
+    result = run_sentence(text, mode="tree")
+    tokens = result.tokens
+    errors = result.errors
 
     structure = {
-        "is_valid": len(errors) == 0,
+        "is_valid": result.is_valid,
         "errors": errors,
         "token_count": len(tokens),
         "unique_token_types": len(set(tokens)),
         "tokens": tokens,
-        "token_details": token_details,
+        "token_details": result.token_details,
         "has_punctuation": any(
             t in ["PUNCT", "COMMA", "SEMICOLON", "COLON"] for t in tokens
         ),
         "is_question": "QUESTION_WORD" in tokens or text.strip().endswith("?"),
         "is_exclamation": text.strip().endswith("!"),
-        "word_count": len([t for t in tokens if t == "WORD"])
+        "word_count": len([t for t in tokens if t == "WORD"]),
+        "phrases": extract_features_from_tree(result.tree)
     }
 
     return structure
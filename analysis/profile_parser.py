@@ -0,0 +1,157 @@
+"""
+profile_parser.py - Decision profiling report for SentenceParser
+
+Parses a corpus with the profiling simulator (parse_profiler.py) and
+writes, per grammar decision and per rule: invocations, prediction
+time, SLL/LL lookahead depth, DFA misses, LL fallbacks and ambiguities.
+Run it before and after a grammar change and compare the reports
+(--json gives a machine-readable version).
+
+Usage (from the project root):
+    python -m analysis.profile_parser [--corpus answers.txt] [--fuzz 0]
+        [--prediction sll_first|ll] [--output report.txt] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from analysis.benchmark_parser import SAMPLE_ANSWERS
+from analysis.parser_runner import PREDICTION_STRATEGIES, profile_sentences
+from analysis.warmup import WARMUP_CORPUS
+from config import Config
+
+
+def load_corpus(path: str = None, fuzz: int = 0) -> list:
+    if path:
+        with open(path, encoding="utf-8") as f:
+            corpus = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        corpus = list(WARMUP_CORPUS) + list(SAMPLE_ANSWERS)
+
+    if fuzz:
+        from analysis.check_lexer_parity import build_corpus
+        corpus.extend(build_corpus(fuzz, seed=7))
+    return corpus
+
+
+def build_report(profiler, stage_counts: dict, corpus_size: int,
+                 prediction: str, elapsed: float) -> dict:
+    decisions = []
+    for info in profiler.decisions:
+        if not info.invocations:
+            continue
+        data = info.as_dict()
+        data["label"] = profiler.describe_decision(info.decision)
+        data["rule"] = data["label"].split(" ")[0]
+        data["sll_avg_look"] = info.sll_total_look / info.invocations
+        decisions.append(data)
+
+    rules = {}
+    for data in decisions:
+        totals = rules.setdefault(data["rule"], {
+            "rule": data["rule"], "invocations": 0, "time_ns": 0,
+            "sll_total_look": 0, "sll_atn_transitions": 0,
+            "ll_fallbacks": 0, "ambiguities": 0
+        })
+        for key in ("invocations", "time_ns", "sll_total_look",
+                    "sll_atn_transitions", "ll_fallbacks", "ambiguities"):
+            totals[key] += data[key]
+
+    prediction_ns = sum(d["time_ns"] for d in decisions)
+    return {
+        "prediction": prediction,
+        "sentences": corpus_size,
+        "parse_stages": stage_counts,
+        "elapsed_ms": elapsed * 1000,
+        "prediction_ms": prediction_ns / 1e6,
+        "decisions": sorted(decisions, key=lambda d: -d["time_ns"]),
+        "rules": sorted(rules.values(), key=lambda r: -r["time_ns"]),
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        "=" * 78,
+        "SentenceParser decision profile",
+        "=" * 78,
+        f"Sentences: {report['sentences']}   prediction: {report['prediction']}"
+        f"   stages: {report['parse_stages']}",
+        f"Total parse time: {report['elapsed_ms']:.1f} ms, "
+        f"of which adaptivePredict: {report['prediction_ms']:.1f} ms "
+        f"(cold DFA)",
+        "",
+        "By rule",
+        f"{'rule':<22}{'calls':>8}{'time ms':>10}{'share':>8}"
+        f"{'avg look':>10}{'ATN steps':>11}{'LL':>6}{'ambig':>7}",
+    ]
+    total_ns = max(report["prediction_ms"] * 1e6, 1)
+    for r in report["rules"]:
+        lines.append(
+            f"{r['rule']:<22}{r['invocations']:>8}{r['time_ns'] / 1e6:>10.2f}"
+            f"{r['time_ns'] / total_ns:>8.0%}"
+            f"{r['sll_total_look'] / r['invocations']:>10.2f}"
+            f"{r['sll_atn_transitions']:>11}{r['ll_fallbacks']:>6}"
+            f"{r['ambiguities']:>7}"
+        )
+
+    lines += [
+        "",
+        "By decision",
+        f"{'decision':<28}{'calls':>7}{'time ms':>9}{'SLL look':>13}"
+        f"{'LL look':>10}{'DFA/ATN':>10}{'LL':>5}{'ctx':>5}{'amb':>5}{'err':>5}",
+    ]
+    for d in report["decisions"]:
+        sll_look = f"{d['sll_avg_look']:.1f}/{d['sll_max_look']}"
+        ll_look = (f"{d['ll_total_look'] / max(d['ll_fallbacks'], 1):.1f}"
+                   f"/{d['ll_max_look']}" if d["ll_max_look"] else "-")
+        lines.append(
+            f"{str(d['decision']) + ' ' + d['label']:<28}{d['invocations']:>7}"
+            f"{d['time_ns'] / 1e6:>9.2f}{sll_look:>13}{ll_look:>10}"
+            f"{str(d['sll_dfa_transitions']) + '/' + str(d['sll_atn_transitions']):>10}"
+            f"{d['ll_fallbacks']:>5}{d['context_sensitivities']:>5}"
+            f"{d['ambiguities']:>5}{d['errors']:>5}"
+        )
+
+    lines += [
+        "",
+        "SLL look = average/max tokens examined; DFA/ATN = cached vs",
+        "simulated prediction steps; LL = full-context fallbacks;",
+        "ctx = context sensitivities; amb = ambiguities; err = no viable alt.",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="one sentence per line")
+    parser.add_argument("--fuzz", type=int, default=0,
+                        help="add N generated lines from the lexer vocabulary")
+    parser.add_argument("--prediction", choices=PREDICTION_STRATEGIES,
+                        default=Config.PARSE_PREDICTION)
+    parser.add_argument("--output", help="write the report here")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.fuzz)
+
+    start = time.perf_counter()
+    profiler, stage_counts = profile_sentences(corpus, args.prediction)
+    elapsed = time.perf_counter() - start
+
+    report = build_report(profiler, stage_counts, len(corpus),
+                          args.prediction, elapsed)
+    text = (json.dumps(report, indent=2) if args.json
+            else format_report(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.output}")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
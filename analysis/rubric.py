@@ -0,0 +1,343 @@
+"""
+rubric.py - Declarative scoring rubric, compiled into per-goal plans
+
+The scoring rubric (section weights, per-goal rules, penalties, style
+bands and the model-sentence requirements) lives in rubric.json
+instead of if/elif chains. At load time it is validated and compiled:
+
+- every goal gets a flat plan: the rules of all sections for that goal
+  (goal-specific rules, or the section's "default" ones) plus the
+  penalties, as (section, condition, points, per, cap, reason) tuples
+- each plan is turned into one generated Python function: conditions
+  become inline comparisons on the PatternScanner counts and substring
+  tests on the text, so scoring costs what the hand-written if/elif
+  chain did (vector_scoring.py compiles the same plans to NumPy)
+
+RubricLoader re-reads the file when it changes on disk (checked at
+most once per CHECK_INTERVAL, same mtime/size signature as the
+scenario store). A file that fails to load or validate is reported
+and the previous rubric stays in use.
+"""
+
+import json
+import operator
+import os
+import threading
+import time
+
+from analysis.frozen import freeze
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# Seconds between two os.stat() checks of the rubric file
+CHECK_INTERVAL = 1.0
+
+
+class Rubric:
+    """One compiled version of rubric.json. Read-only."""
+
+    def __init__(self, data: dict, categories=None, signature: str = None):
+        self.signature = signature
+        self.version = data.get("version")
+        # Scanner categories a "count" / "per" may refer to (None: any)
+        self._categories = set(categories) if categories is not None else None
+        # Feature names used by the rules, in first-use order: count
+        # names and "contains:<term>|<term>" keys (see vector_scoring.py)
+        self.features = {}
+
+        self.sections = tuple(
+            (section["name"], section["max"]) for section in data["sections"]
+        )
+        if not self.sections:
+            raise ValueError("The rubric has no sections")
+
+        goals = []
+        for section in data["sections"]:
+            for goal in section.get("goals", {}):
+                if goal != "default" and goal not in goals:
+                    goals.append(goal)
+        self.goals = tuple(goals)
+
+        penalties = tuple(
+            self._compile_rule(-1, rule, "penalties")
+            for rule in data.get("penalties", [])
+        )
+        self.plans = {
+            goal: self._compile_plan(data["sections"], goal) + penalties
+            for goal in self.goals
+        }
+        self.default_plan = (
+            self._compile_plan(data["sections"], None) + penalties
+        )
+
+        low, high = data.get("overall_range", [0, 100])
+        self.overall_range = (int(low), int(high))
+
+        self._scorers = {
+            goal: self._generate_scorer(goal, plan)
+            for goal, plan in self.plans.items()
+        }
+        self._default_scorer = self._generate_scorer(None, self.default_plan)
+
+        self.styles = self._compile_styles(data["styles"])
+        self.style_names = tuple(style for _, style in self.styles)
+
+        self.model_examples = freeze(data.get("model_examples", {}))
+        self.features = tuple(self.features)
+
+    # =====================================================
+    # SCORING
+    # =====================================================
+    def score(self, text: str, counts: dict, goal: str = None) -> dict:
+        """
+        {"overall": int, "breakdown": {section: {score, max, reasons}}}
+        for a lower-cased answer and its PatternScanner counts.
+        """
+        return self._scorers.get(goal, self._default_scorer)(text, counts)
+
+    def style(self, overall: int) -> str:
+        for minimum, style in self.styles:
+            if minimum is None or overall >= minimum:
+                return style
+        return self.styles[-1][1]
+
+    # =====================================================
+    # COMPILATION
+    # =====================================================
+    def _compile_plan(self, sections: list, goal) -> tuple:
+        plan = []
+        for index, section in enumerate(sections):
+            if "goals" in section:
+                goal_rules = section["goals"]
+                rules = goal_rules.get(goal, goal_rules.get("default", []))
+            else:
+                rules = section.get("rules", [])
+            where = f"section {section['name']!r}"
+            plan.extend(self._compile_rule(index, rule, where) for rule in rules)
+        return tuple(plan)
+
+    def _compile_rule(self, section: int, rule: dict, where: str) -> tuple:
+        points = rule.get("points")
+        if not isinstance(points, int):
+            raise ValueError(f"Rule without integer points in {where}: {rule}")
+
+        reason = rule.get("reason")
+        if reason is not None and not isinstance(reason, str):
+            raise ValueError(f"Rule reason must be a string in {where}: {rule}")
+
+        per = rule.get("per")
+        if per is not None:
+            cap = rule.get("cap")
+            if cap is not None and not isinstance(cap, int):
+                raise ValueError(f"Rule cap must be an integer in {where}")
+            self._check_count(per, where)
+            return (section, None, points, per, cap, reason)
+
+        condition = None
+        if "if" in rule:
+            condition = self._parse_condition(rule["if"], where)
+        if reason:
+            reason = reason.format(points=points)
+        return (section, condition, points, None, None, reason)
+
+    def _generate_scorer(self, goal, plan: tuple):
+        """
+        Python source for one plan, compiled into score(text, counts).
+        Only validated names and repr() literals reach the source.
+        """
+        lines = ["def score(text, counts):"]
+        for i in range(len(self.sections)):
+            lines.append(f"    score_{i} = 0")
+            lines.append(f"    reasons_{i} = []")
+        lines.append("    penalty = 0")
+
+        for section, condition, points, per, cap, reason in plan:
+            target = f"score_{section}" if section >= 0 else "penalty"
+            if per is not None:
+                lines.append(f"    count = counts[{per!r}]")
+                lines.append("    if count:")
+                value = f"count * {points!r}"
+                if cap is not None:
+                    value = f"min({cap!r}, {value})"
+                lines.append(f"        points = {value}")
+                lines.append(f"        {target} += points")
+                if reason and section >= 0:
+                    lines.append(f"        reasons_{section}.append("
+                                 f"{reason!r}.format(points=points))")
+                continue
+
+            indent = "    "
+            if condition is not None:
+                lines.append(f"    if {_expression(condition)}:")
+                indent = "        "
+            lines.append(f"{indent}{target} += {points!r}")
+            if reason and section >= 0:
+                lines.append(f"{indent}reasons_{section}.append({reason!r})")
+
+        scores = " + ".join(f"score_{i}" for i in range(len(self.sections)))
+        low, high = self.overall_range
+        lines.append(f"    total = {scores} + penalty")
+        lines.append("    return {")
+        lines.append(f"        'overall': max({low!r}, min({high!r}, int(total))),")
+        lines.append("        'breakdown': {")
+        for i, (name, maximum) in enumerate(self.sections):
+            lines.append(f"            {name!r}: {{'score': score_{i}, "
+                         f"'max': {maximum!r}, 'reasons': reasons_{i}}},")
+        lines.append("        }")
+        lines.append("    }")
+
+        namespace = {}
+        exec(compile("\n".join(lines), f"<rubric plan {goal}>", "exec"),
+             namespace)
+        return namespace["score"]
+
+    def _parse_condition(self, spec: dict, where: str) -> tuple:
+        """JSON condition -> ("count", name, op, value) / ("contains",
+        terms) / ("any" | "all", conditions) / ("not", condition)."""
+        if not isinstance(spec, dict) or len(spec) not in (1, 3):
+            raise ValueError(f"Bad condition in {where}: {spec}")
+
+        if "count" in spec:
+            name, op, value = spec["count"], spec.get("op"), spec.get("value")
+            self._check_count(name, where)
+            if op not in OPERATORS or not isinstance(value, int):
+                raise ValueError(f"Bad count condition in {where}: {spec}")
+            return ("count", name, op, value)
+
+        if "contains" in spec:
+            terms = tuple(spec["contains"])
+            if not terms or not all(isinstance(t, str) and t for t in terms):
+                raise ValueError(f"Bad contains condition in {where}: {spec}")
+            self.features.setdefault(contains_feature(terms), None)
+            return ("contains", terms)
+
+        for kind in ("any", "all"):
+            if kind in spec:
+                parts = tuple(self._parse_condition(c, where) for c in spec[kind])
+                if not parts:
+                    raise ValueError(f"Empty {kind!r} condition in {where}")
+                return (kind, parts)
+
+        if "not" in spec:
+            return ("not", self._parse_condition(spec["not"], where))
+
+        raise ValueError(f"Unknown condition in {where}: {spec}")
+
+    def _check_count(self, name: str, where: str):
+        if self._categories is not None and name not in self._categories:
+            raise ValueError(f"Unknown count {name!r} in {where}")
+        self.features.setdefault(name, None)
+
+    @staticmethod
+    def _compile_styles(styles: list) -> tuple:
+        if not styles:
+            raise ValueError("Styles must not be empty")
+        bands = tuple((band.get("min"), band["style"]) for band in styles)
+        minimums = [m for m, _ in bands[:-1]]
+        if (bands[-1][0] is not None or None in minimums
+                or minimums != sorted(minimums, reverse=True)):
+            raise ValueError(
+                "Styles must be ordered by descending min and end with "
+                "a catch-all band (min: null)"
+            )
+        return bands
+
+
+def contains_feature(terms: tuple) -> str:
+    """Feature name of a "contains" condition, e.g. "contains:because|but"."""
+    return "contains:" + "|".join(terms)
+
+
+def _expression(condition: tuple) -> str:
+    """Condition tuple -> Python expression over text and counts."""
+    kind = condition[0]
+
+    if kind == "count":
+        _, name, op, value = condition
+        return f"counts[{name!r}] {op} {value!r}"
+
+    if kind == "contains":
+        return "(" + " or ".join(f"{t!r} in text" for t in condition[1]) + ")"
+
+    if kind == "not":
+        return f"(not {_expression(condition[1])})"
+
+    joiner = " or " if kind == "any" else " and "
+    return "(" + joiner.join(_expression(c) for c in condition[1]) + ")"
+
+
+# =====================================================
+# LOADING + HOT RELOAD
+# =====================================================
+def load_rubric(path: str, categories=None) -> Rubric:
+    # Stat first: a write racing with the read is picked up next check
+    signature = _stat(path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return Rubric(data, categories, signature=signature)
+
+
+class RubricLoader:
+    """
+    Keeps the compiled rubric of one file current.
+
+    get() is the hot path: it returns the compiled Rubric and, at most
+    once per check_interval, stats the file and recompiles it if it
+    changed. Only one thread reloads; the others keep using the
+    previous Rubric meanwhile.
+    """
+
+    def __init__(self, path: str, categories=None,
+                 check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.categories = categories
+        self.check_interval = check_interval
+        self._rubric = None
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Rubric:
+        if self._rubric is None:
+            with self._lock:
+                if self._rubric is None:
+                    # First load: errors propagate, there is no fallback
+                    self._rubric = load_rubric(self.path, self.categories)
+                    self._signature = self._rubric.signature
+                    self._next_check = time.monotonic() + self.check_interval
+        elif time.monotonic() >= self._next_check:
+            self._reload_if_changed()
+        return self._rubric
+
+    def _reload_if_changed(self):
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            signature = _stat(self.path)
+            if signature == self._signature:
+                return
+            # Not retried until the file changes again
+            self._signature = signature
+            try:
+                self._rubric = load_rubric(self.path, self.categories)
+                print(f"Rubric reloaded from {self.path}")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Rubric reload failed, keeping the previous one: {e}")
+        finally:
+            self._lock.release()
+
+
+def _stat(path: str) -> str:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    return f"{st.st_mtime_ns}:{st.st_size}"
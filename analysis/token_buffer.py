@@ -0,0 +1,127 @@
+"""
+token_buffer.py - Compact, integer-coded token storage
+
+A sentence's tokens are kept as parallel typed arrays (type ids,
+start, stop, line, column) instead of a list of names plus one
+six-key dict per token. Names and dicts are built only when a caller
+asks for them, so a request that only scores the answer allocates
+five small arrays instead of dozens of dicts.
+
+TokenBuffer is an immutable Sequence: iterating it or indexing it
+yields the same dicts the old token_details list held (fresh ones on
+every read), and its arrays cannot be changed once it is built, so a
+cached analysis result that holds one stays read-only. to_list() gives
+plain dicts for JSON and other serialization boundaries.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from analysis.generated.SentenceLexer import SentenceLexer
+
+EOF = -1
+
+_SYMBOLIC_NAMES = SentenceLexer.symbolicNames
+
+
+class TokenBuffer(Sequence):
+    """
+    Tokens of one (lower-cased) sentence, EOF excluded. Read-only.
+
+    - _types:   array('H') of SentenceLexer token type ids
+    - _starts, _stops, _lines, _columns: array('I') positions
+    """
+
+    __slots__ = ("text", "_types", "_starts", "_stops", "_lines", "_columns")
+
+    def __init__(self, text: str = "", types=None, starts=None, stops=None,
+                 lines=None, columns=None):
+        init = object.__setattr__
+        init(self, "text", text)
+        init(self, "_types", types if types is not None else array("H"))
+        init(self, "_starts", starts if starts is not None else array("I"))
+        init(self, "_stops", stops if stops is not None else array("I"))
+        init(self, "_lines", lines if lines is not None else array("I"))
+        init(self, "_columns", columns if columns is not None else array("I"))
+
+    def _readonly(self, *args):
+        raise TypeError("TokenBuffer is read-only")
+
+    __setattr__ = __delattr__ = _readonly
+
+    @classmethod
+    def from_raw(cls, raw_tokens, text: str) -> "TokenBuffer":
+        """Build from (type, start, stop, line, column) tuples."""
+        types, starts, stops = array("H"), array("I"), array("I")
+        lines, columns = array("I"), array("I")
+        for token_type, start, stop, line, column in raw_tokens:
+            # Skip EOF and tokens without a symbolic name
+            if token_type != EOF and _SYMBOLIC_NAMES[token_type]:
+                types.append(token_type)
+                starts.append(start)
+                stops.append(stop)
+                lines.append(line)
+                columns.append(column)
+        return cls(text, types, starts, stops, lines, columns)
+
+    # =====================================================
+    # ON-DEMAND VIEWS
+    # =====================================================
+    def names(self) -> list:
+        """Symbolic token names, e.g. ["GREETING", "COMMA", ...]."""
+        return [_SYMBOLIC_NAMES[t] for t in self._types]
+
+    def detail(self, index: int) -> dict:
+        start, stop = self._starts[index], self._stops[index]
+        return {
+            "type": _SYMBOLIC_NAMES[self._types[index]],
+            "text": self.text[start:stop + 1],
+            "start": start,
+            "stop": stop,
+            "line": self._lines[index],
+            "column": self._columns[index]
+        }
+
+    def to_list(self) -> list:
+        """The per-token dicts as a new plain list (JSON-serializable)."""
+        return [self.detail(i) for i in range(len(self._types))]
+
+    def count_type(self, token_type: int) -> int:
+        return self._types.count(token_type)
+
+    # =====================================================
+    # SEQUENCE PROTOCOL
+    # =====================================================
+    def __len__(self):
+        return len(self._types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.detail(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return self.detail(index)
+
+    def __eq__(self, other):
+        if isinstance(other, TokenBuffer):
+            return (self._types == other._types
+                    and self._starts == other._starts
+                    and self._stops == other._stops
+                    and self._lines == other._lines
+                    and self._columns == other._columns
+                    and all(self.text[a:b + 1] == other.text[a:b + 1]
+                            for a, b in zip(self._starts, self._stops)))
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TokenBuffer({self.names()!r})"
+
+    def __reduce__(self):
+        return (TokenBuffer, (self.text, self._types, self._starts,
+                              self._stops, self._lines, self._columns))
@@ -0,0 +1,189 @@
+"""
+vector_scoring.py - Vectorized (NumPy) rubric scoring for bulk regrading
+
+Rubric.score() scores one answer at a time. For regrading many stored
+answers (e.g. a whole term after a rubric change) the rubric inputs are
+kept as an integer matrix, one row per answer and one column per
+feature of the rubric (Rubric.features: scanner counts and "contains"
+tests), and each goal's plan from rubric.json is applied to all of its
+rows at once with masks and clipped sums.
+
+    features = extract_features(answers)          # once, Python speed
+    save_features("term.npz", features, goals)
+    ...
+    features, goals = load_features("term.npz")
+    result = score_matrix(features, goals)
+    result["overall"], result["style"]            # int arrays
+
+score_matrix() must agree exactly with the per-answer path;
+check_vector_parity.py verifies it.
+"""
+
+import numpy as np
+
+from analysis.analyzer import get_analyzer, normalize_answer
+from analysis.rubric import OPERATORS, Rubric, contains_feature
+
+
+def current_rubric() -> Rubric:
+    return get_analyzer().rubric.get()
+
+
+# =====================================================
+# FEATURE MATRIX
+# =====================================================
+def feature_row(text: str, rubric: Rubric = None) -> list:
+    """Rubric inputs for one answer, in rubric.features order."""
+    return _row_builder(rubric or current_rubric())(text)
+
+
+def extract_features(texts, rubric: Rubric = None) -> np.ndarray:
+    """(len(texts), len(rubric.features)) int32 matrix of rubric inputs."""
+    rubric = rubric or current_rubric()
+    build_row = _row_builder(rubric)
+    rows = [build_row(text) for text in texts]
+    if not rows:
+        return np.zeros((0, len(rubric.features)), dtype=np.int32)
+    return np.array(rows, dtype=np.int32)
+
+
+def _row_builder(rubric: Rubric):
+    count = get_analyzer().scanner.count
+    # (count name, None) or (None, substring terms) per column
+    columns = [
+        (None, tuple(feature[len("contains:"):].split("|")))
+        if feature.startswith("contains:") else (feature, None)
+        for feature in rubric.features
+    ]
+
+    def build_row(text: str) -> list:
+        text = normalize_answer(text)
+        counts = count(text)
+        return [
+            counts[name] if name is not None
+            else any(term in text for term in terms)
+            for name, terms in columns
+        ]
+
+    return build_row
+
+
+def encode_goals(goals, rubric: Rubric = None) -> np.ndarray:
+    """
+    Goal names -> int16 codes: index into rubric.goals, or
+    len(rubric.goals) for goals without rules of their own.
+    """
+    rubric = rubric or current_rubric()
+    codes = {goal: i for i, goal in enumerate(rubric.goals)}
+    other = len(rubric.goals)
+    return np.fromiter(
+        (codes.get(goal, other) for goal in goals), dtype=np.int16
+    )
+
+
+def save_features(path: str, features: np.ndarray, goals,
+                  rubric: Rubric = None) -> None:
+    """Store the matrix with goal NAMES, so it survives rubric edits."""
+    rubric = rubric or current_rubric()
+    np.savez_compressed(
+        path, features=features, columns=np.array(rubric.features),
+        goals=np.array([goal or "" for goal in goals])
+    )
+
+
+def load_features(path: str, rubric: Rubric = None) -> tuple:
+    """(features, goal codes) for the current rubric."""
+    rubric = rubric or current_rubric()
+    with np.load(path) as data:
+        if tuple(data["columns"]) != rubric.features:
+            raise ValueError(
+                f"{path} was saved with other feature columns; "
+                "re-run extract_features() for this rubric"
+            )
+        goals = [goal or None for goal in data["goals"].tolist()]
+        return data["features"], encode_goals(goals, rubric)
+
+
+# =====================================================
+# VECTORIZED RUBRIC
+# =====================================================
+def score_matrix(features: np.ndarray, goal_codes: np.ndarray,
+                 rubric: Rubric = None) -> dict:
+    """
+    Rubric.score() for every row. Returns int arrays for each section,
+    "overall" and "style" (index into rubric.style_names).
+    """
+    rubric = rubric or current_rubric()
+    column = {name: i for i, name in enumerate(rubric.features)}
+    rows = len(features)
+
+    sections = [np.zeros(rows, dtype=np.int64) for _ in rubric.sections]
+    penalty = np.zeros(rows, dtype=np.int64)
+
+    plans = [rubric.plans[goal] for goal in rubric.goals]
+    plans.append(rubric.default_plan)
+
+    for code, plan in enumerate(plans):
+        selected = goal_codes == code
+        if not selected.any():
+            continue
+        subset = features[selected]
+        # Summed on the goal's rows, scattered back once per goal
+        totals = [0] * (len(rubric.sections) + 1)
+
+        for section, condition, points, per, cap, _ in plan:
+            if per is not None:
+                earned = subset[:, column[per]].astype(np.int64) * points
+                if cap is not None:
+                    earned = np.minimum(cap, earned)
+            elif condition is not None:
+                earned = _mask(condition, subset, column) * points
+            else:
+                earned = points
+            totals[section] = totals[section] + earned
+
+        for target, total in zip(sections + [penalty], totals):
+            target[selected] = total
+
+    low, high = rubric.overall_range
+    overall = np.clip(sum(sections) + penalty, low, high)
+
+    result = {
+        name: sections[i] for i, (name, _) in enumerate(rubric.sections)
+    }
+    result["overall"] = overall
+    result["style"] = _style_codes(overall, rubric)
+    return result
+
+
+def _mask(condition: tuple, features: np.ndarray, column: dict) -> np.ndarray:
+    """Condition tuple (see Rubric._parse_condition) -> bool array."""
+    kind = condition[0]
+
+    if kind == "count":
+        _, name, op, value = condition
+        return OPERATORS[op](features[:, column[name]], value)
+
+    if kind == "contains":
+        return features[:, column[contains_feature(condition[1])]] > 0
+
+    if kind == "not":
+        return ~_mask(condition[1], features, column)
+
+    parts = [_mask(c, features, column) for c in condition[1]]
+    if kind == "any":
+        return np.logical_or.reduce(parts)
+    return np.logical_and.reduce(parts)
+
+
+def _style_codes(overall: np.ndarray, rubric: Rubric) -> np.ndarray:
+    # Catch-all band first, then every higher band overrides
+    codes = np.full(len(overall), len(rubric.styles) - 1, dtype=np.int8)
+    for index in range(len(rubric.styles) - 2, -1, -1):
+        codes[overall >= rubric.styles[index][0]] = index
+    return codes
+
+
+def style_names(style_codes: np.ndarray, rubric: Rubric = None) -> np.ndarray:
+    rubric = rubric or current_rubric()
+    return np.array(rubric.style_names)[style_codes]
@@ -0,0 +1,274 @@
+"""
+warmup.py - Startup warm-up and on-disk cache for the ANTLR DFAs
+
+SentenceLexer and SentenceParser build their DFA caches lazily: the
+first sentences a worker sees are simulated on the ATN, which is several
+times slower than walking the cached DFA. The DFAs are class-level, so
+they are shared by every pipeline in the process.
+
+- warm_up() runs a representative corpus through the lexer and both
+  parser stages (SLL and the LL fallback)
+- save_dfa_cache() / load_dfa_cache() pickle the warmed DFA states so
+  fresh gunicorn workers can start hot without re-simulating; the file
+  is installed once per process, before the first pipeline is built
+  (parser_runner.install_dfa_cache), never under a running parse
+
+ATN states and runtime singletons are not stored in the file; they are
+written as references and re-attached to the live ATN on load. The
+cache is stamped with a fingerprint of both serialized ATNs and the
+runtime version, so a regenerated grammar simply ignores an old file.
+Only load cache files this app wrote itself (pickle executes code).
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import sys
+import threading
+import time
+from importlib import metadata
+
+from antlr4.PredictionContext import PredictionContext
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.ATNState import ATNState
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.LexerAction import (
+    LexerMoreAction, LexerPopModeAction, LexerSkipAction
+)
+from antlr4.atn.SemanticContext import SemanticContext
+from analysis.generated.SentenceLexer import SentenceLexer
+from analysis.generated.SentenceParser import SentenceParser
+from analysis.parser_runner import install_dfa_cache, run_sentence
+
+CACHE_VERSION = 1
+
+# Covers every token rule and the main sentence shapes: greetings,
+# requests, apologies, refusals, questions, emoticons, plus inputs that
+# fail SLL so the LL fallback DFAs are warmed too.
+WARMUP_CORPUS = [
+    "Hi, could you please help me with this problem? Thank you!",
+    "Hello! Can you show me how to draw a cat?",
+    "Good morning, would you mind sharing your crayons?",
+    "I am really sorry, I didn't mean to break your pencil.",
+    "Sorry, my bad. I apologize, it won't happen again.",
+    "I'm so sorry that you feel sad, I understand.",
+    "Thank you for inviting me, but I feel tired today.",
+    "Thanks so much, that's very kind of you :)",
+    "I like your drawing, maybe you could add a tail.",
+    "I think your idea is good, but maybe we can try another way.",
+    "Perhaps we might share the toy, if that's okay?",
+    "No! I don't want to play with you.",
+    "You must give it back right now",
+    "Stop it, I hate this! You never listen.",
+    "Shut up, go away -- this is stupid!!",
+    "Why did you take my book? Where is it?",
+    "What do you think about playing together after lunch?",
+    "Could we please take turns with the swing; I waited too.",
+    "Excuse me, may I sit here? :-)",
+    "I feel happy and excited, it's a wonderful day <3",
+    "Let's be friends. See you tomorrow, bye!",
+    "Please, please, please stop...",
+    "sorry",
+    "thank you",
+    "hi",
+    "my friend's dog is 3 years old",
+    "can you maybe not do that?",
+    "i'm not angry, i just need a minute.",
+    "€ weird ~ x :-x <y",
+    "sorry\nmy bad, it's okay",
+]
+
+_SINGLETONS = {
+    "atn_error": ATNSimulator.ERROR,
+    "lexer_error": LexerATNSimulator.ERROR,
+    "empty_context": PredictionContext.EMPTY,
+    "no_semantic_context": SemanticContext.NONE,
+    "skip_action": LexerSkipAction.INSTANCE,
+    "more_action": LexerMoreAction.INSTANCE,
+    "pop_mode_action": LexerPopModeAction.INSTANCE,
+}
+
+_RECOGNIZERS = {
+    "lexer": SentenceLexer,
+    "parser": SentenceParser,
+}
+
+_cache_lock = threading.Lock()
+
+
+# =====================================================
+# WARM-UP
+# =====================================================
+def warm_up(corpus: list = None) -> float:
+    """
+    Lex and parse the corpus with the ANTLR backend (tree mode, both
+    prediction strategies). Returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    for text in corpus or WARMUP_CORPUS:
+        run_sentence(text, mode="tree", backend="antlr")
+        run_sentence(text, mode="tree", backend="antlr", prediction="ll")
+    return time.perf_counter() - start
+
+
+def dfa_state_count() -> dict:
+    """Number of cached DFA states per recognizer."""
+    return {
+        name: sum(len(dfa._states) for dfa in recognizer.decisionsToDFA)
+        for name, recognizer in _RECOGNIZERS.items()
+    }
+
+
+# =====================================================
+# DFA CACHE FILE
+# =====================================================
+def grammar_fingerprint() -> str:
+    """Identifies the generated ATNs and the runtime that built them."""
+    digest = hashlib.sha256()
+    for recognizer in _RECOGNIZERS.values():
+        digest.update(repr(_serialized_atn(recognizer)).encode())
+    digest.update(_runtime_version().encode())
+    digest.update(sys.version.split()[0].encode())
+    return digest.hexdigest()
+
+
+def save_dfa_cache(path: str) -> bool:
+    """Write the current DFA states to path (atomically)."""
+    payload = {
+        "version": CACHE_VERSION,
+        "fingerprint": grammar_fingerprint(),
+        "dfas": {
+            name: [(dfa.s0, list(dfa._states))
+                   for dfa in recognizer.decisionsToDFA]
+            for name, recognizer in _RECOGNIZERS.items()
+        },
+    }
+
+    buffer = io.BytesIO()
+    with _cache_lock:
+        _DFAPickler(buffer).dump(payload)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error saving DFA cache: {e}")
+        return False
+    return True
+
+
+def load_dfa_cache(path: str) -> bool:
+    """
+    Install DFA states from path. Returns False (and leaves the
+    current DFAs alone) if the file is missing, unreadable or stale.
+
+    Both recognizers are validated before either is touched. The DFAs
+    are swapped without coordinating with running parses, so this must
+    run before any pipeline exists: call it through
+    parser_runner.install_dfa_cache(), which does it once, ahead of the
+    first SentencePipeline.
+    """
+    if not os.path.exists(path):
+        return False
+
+    try:
+        with open(path, "rb") as f:
+            payload = _DFAUnpickler(f).load()
+    except Exception as e:
+        print(f"Error loading DFA cache: {e}")
+        return False
+
+    if (payload.get("version") != CACHE_VERSION
+            or payload.get("fingerprint") != grammar_fingerprint()):
+        return False
+
+    dfas = payload.get("dfas", {})
+    for name, recognizer in _RECOGNIZERS.items():
+        saved = dfas.get(name)
+        if saved is None or len(saved) != len(recognizer.decisionsToDFA):
+            return False
+
+    with _cache_lock:
+        for name, recognizer in _RECOGNIZERS.items():
+            for dfa, (s0, states) in zip(recognizer.decisionsToDFA, dfas[name]):
+                if dfa.precedenceDfa:
+                    continue  # s0 is built by the DFA itself
+                dfa._states = {state: state for state in states}
+                dfa.s0 = s0
+    return True
+
+
+def prepare(cache_path: str = None) -> str:
+    """
+    Make the DFAs hot for this process: load the cache file if it is
+    usable (once, before the first pipeline, see install_dfa_cache()),
+    otherwise warm up and (re)write it. Returns what happened.
+    """
+    if install_dfa_cache(cache_path or ""):
+        return "loaded"
+
+    warm_up()
+    if cache_path:
+        save_dfa_cache(cache_path)
+    return "warmed"
+
+
+# =====================================================
+# PICKLING HELPERS
+# =====================================================
+class _DFAPickler(pickle.Pickler):
+    """Writes ATN states and runtime singletons as references."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._singletons = {id(obj): key for key, obj in _SINGLETONS.items()}
+        self._atn_names = {
+            id(recognizer.atn): name
+            for name, recognizer in _RECOGNIZERS.items()
+        }
+
+    def persistent_id(self, obj):
+        key = self._singletons.get(id(obj))
+        if key is not None:
+            return ("singleton", key)
+        if isinstance(obj, ATNState):
+            return ("state", self._atn_names[id(obj.atn)], obj.stateNumber)
+        return None
+
+
+class _DFAUnpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "singleton":
+            return _SINGLETONS[pid[1]]
+        if kind == "state":
+            return _RECOGNIZERS[pid[1]].atn.states[pid[2]]
+        raise pickle.UnpicklingError(f"Unknown reference: {pid!r}")
+
+
+def _serialized_atn(recognizer):
+    # The generated modules expose serializedATN() at module level
+    module = sys.modules[recognizer.__module__]
+    return module.serializedATN()
+
+
+def _runtime_version() -> str:
+    try:
+        return metadata.version("antlr4-python3-runtime")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+if __name__ == "__main__":
+    from config import Config
+
+    elapsed = warm_up()
+    print(f"Warm-up: {elapsed * 1000:.0f} ms, DFA states: {dfa_state_count()}")
+    if save_dfa_cache(Config.ANTLR_DFA_CACHE):
+        print(f"Saved DFA cache to {os.path.abspath(Config.ANTLR_DFA_CACHE)}")
@@ -1,3 +1,5 @@
+import threading
+
 from flask import Flask
 from config import Config
 
@@ -12,16 +14,43 @@ def create_app():
     from routes.answer import answer_bp
     from routes.admin import admin_bp
     from routes.feedback import feedback_bp
+    from routes.live import live_bp
+    from routes.metrics import metrics_bp
 
     app.register_blueprint(home_bp)
     app.register_blueprint(scenario_bp)
     app.register_blueprint(answer_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(feedback_bp)
+    app.register_blueprint(live_bp)
+    app.register_blueprint(metrics_bp)
+
+    # Fill the model sentence pools of default scenarios whenever
+    # default_scenarios.json is (re-)imported
+    from logic.model_example_jobs import pregeneration
+    from logic.scenario_store import store
+    store.on_defaults_synced(pregeneration.submit)
+
+    # Build (or load) the lexer/parser DFAs in the background, so
+    # booting does not wait for ANTLR and the first feedback is fast.
+    # A cache file is installed before the first pipeline parses
+    # (whichever comes first: this thread or a request), not later
+    if Config.ANALYSIS_WARMUP:
+        threading.Thread(
+            target=_warm_up_analysis, name="analysis-warmup", daemon=True
+        ).start()
 
     return app
 
 
+def _warm_up_analysis():
+    try:
+        from analysis.warmup import prepare
+        prepare(Config.ANTLR_DFA_CACHE or None)
+    except Exception as e:
+        print(f"Error warming up analysis: {e}")
+
+
 if __name__ == "__main__":
     app = create_app()
 
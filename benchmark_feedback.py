@@ -0,0 +1,121 @@
+"""
+benchmark_feedback.py - Allocations per feedback request: shared vs fresh engines
+
+Runs the engine work behind /feedback (evaluate, lesson, hint) for
+every (sample answer, default scenario) pair twice:
+
+- fresh:  ContextAwareAnalyzer, ResponseEvaluator, LessonEngine and
+          HintEngine built for the request, as the old wrappers did
+- shared: the module-level engine instances
+
+and reports, per request, the memory allocated while it runs
+(tracemalloc peak) and the time (measured without tracing). The
+analysis cache is cleared before every request, so both modes do the
+same analysis work.
+
+Only pairs scoring >= 70 are used: below that the evaluator asks the
+LLM for a model sentence, which this benchmark does not call.
+
+Usage (from the project root):
+    python benchmark_feedback.py [--rounds 20]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from analysis.analyzer import ContextAwareAnalyzer, clear_analysis_cache
+from analysis.benchmark_parser import SAMPLE_ANSWERS
+from logic import evaluator, hint_engine, lesson_engine
+from logic.scenario_store import get_default_scenarios
+
+GOOD_ANSWERS = [
+    "Hi Alex, I like your drawing and I understand it was an accident. "
+    "Maybe we can fix it together.",
+    "Thank you for inviting me, but I feel tired today because I was sick. "
+    "Maybe we can play tomorrow.",
+    "I am really sorry, it was my fault. I understand you feel sad.",
+    "Hello, could you please help me with this? Thank you so much!",
+]
+
+
+def feedback_request(answer: str, scenario: dict, fresh: bool):
+    """The engine calls show_feedback() makes for one request."""
+    if fresh:
+        ContextAwareAnalyzer()
+        engines = (evaluator.ResponseEvaluator(), lesson_engine.LessonEngine(),
+                   hint_engine.HintEngine())
+    else:
+        engines = (evaluator._evaluator, lesson_engine._engine,
+                   hint_engine._engine)
+    response_evaluator, lessons, hints = engines
+
+    evaluation = response_evaluator.evaluate_response(
+        user_answer=answer,
+        scenario_goal=scenario["goal"],
+        scenario_context={
+            "title": scenario["title"],
+            "story": scenario["story"],
+            "question": scenario["question"]
+        }
+    )
+    lessons.generate_lesson(answer, scenario, evaluation)
+    hints.generate_hint(answer, scenario, evaluation)
+
+
+def measure(pairs: list, rounds: int, fresh: bool) -> tuple:
+    """(average peak bytes, average seconds) per request."""
+    peaks = []
+    for answer, scenario in pairs:
+        clear_analysis_cache()
+        tracemalloc.start()
+        feedback_request(answer, scenario, fresh)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    # Timed separately: tracing slows every allocation down
+    elapsed = 0.0
+    for _ in range(rounds):
+        for answer, scenario in pairs:
+            clear_analysis_cache()
+            start = time.perf_counter()
+            feedback_request(answer, scenario, fresh)
+            elapsed += time.perf_counter() - start
+
+    return sum(peaks) / len(pairs), elapsed / (len(pairs) * rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    analyzer = ContextAwareAnalyzer()
+    pairs = [
+        (answer, scenario)
+        for scenario in get_default_scenarios()
+        for answer in SAMPLE_ANSWERS + GOOD_ANSWERS
+        if analyzer.score_text(answer.lower(), scenario["goal"])
+        ["overall_score"] >= 70
+    ]
+    if not pairs:
+        print("No (answer, scenario) pair scores >= 70")
+        return
+
+    # Warm up imports, regex and DFA caches outside the measurement
+    measure(pairs, 1, fresh=True)
+
+    fresh_bytes, fresh_time = measure(pairs, args.rounds, fresh=True)
+    shared_bytes, shared_time = measure(pairs, args.rounds, fresh=False)
+
+    print(f"{len(pairs)} (answer, scenario) pairs x {args.rounds} rounds")
+    print(f"Fresh engines:  {fresh_bytes / 1024:7.1f} KB allocated (peak), "
+          f"{fresh_time * 1e6:7.0f} µs per request")
+    print(f"Shared engines: {shared_bytes / 1024:7.1f} KB allocated (peak), "
+          f"{shared_time * 1e6:7.0f} µs per request")
+    print(f"Saved per request: {(fresh_bytes - shared_bytes) / 1024:.1f} KB, "
+          f"{(fresh_time - shared_time) * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+check_startup.py - Cold-start budget for the Flask app
+
+Starts a fresh interpreter, runs create_app() (with the analysis
+warm-up and model sentence pre-generation off) and serves the home,
+scenario and admin pages. Then boots once more with the default
+settings, where both background jobs start. Fails (exit status 1) if:
+- booting takes longer than the budget (best of several runs)
+- any of those routes loads the LLM client or the ANTLR runtime
+- the default boot loads them on the booting thread (the background
+  threads may)
+
+Usage (from the project root):
+    python check_startup.py [--budget-ms 600] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Modules only the feedback route may load
+HEAVY_MODULES = [
+    "openai",
+    "antlr4",
+    "analysis.generated.SentenceParser",
+    "analysis.analyzer",
+    "logic.evaluator",
+]
+
+CHILD = """
+import json, os, sys, threading, time
+
+class BootImports:
+    # Heavy modules first imported by the booting (main) thread
+    def __init__(self):
+        self.seen = []
+    def find_spec(self, name, path=None, target=None):
+        if name in HEAVY and threading.current_thread() is threading.main_thread():
+            self.seen.append(name)
+        return None
+
+tracker = BootImports()
+sys.meta_path.insert(0, tracker)
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+boot = time.perf_counter() - start
+sys.meta_path.remove(tracker)
+
+if DEFAULTS:
+    print(json.dumps({"boot_ms": boot * 1000, "loaded": tracker.seen}))
+    sys.stdout.flush()
+    # Do not wait for the warm-up / pre-generation threads
+    os._exit(0)
+
+from logic.scenario_store import get_default_scenarios
+client = app.test_client()
+scenarios = get_default_scenarios()
+paths = ["/", "/admin/create"]
+if scenarios:
+    paths.append(f"/scenario/{scenarios[0]['id']}")
+statuses = {path: client.get(path).status_code for path in paths}
+
+print(json.dumps({
+    "boot_ms": boot * 1000,
+    "statuses": statuses,
+    "loaded": [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+
+def measure_once(defaults: bool = False) -> dict:
+    env = dict(os.environ)
+    if not defaults:
+        env.update(ANALYSIS_WARMUP="0", MODEL_EXAMPLE_POOL_SIZE="0")
+    code = f"HEAVY = {HEAVY_MODULES!r}\nDEFAULTS = {defaults!r}\n{CHILD}"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=600)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = [measure_once() for _ in range(args.runs)]
+    boot_ms = min(r["boot_ms"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+    statuses = results[-1]["statuses"]
+    default_boot = measure_once(defaults=True)
+
+    print(f"Boot: {boot_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for path, status in statuses.items():
+        print(f"  GET {path} -> {status}")
+    print(f"Boot with default settings: {default_boot['boot_ms']:.0f} ms")
+
+    failures = []
+    if boot_ms > args.budget_ms:
+        failures.append("boot time over budget")
+    if loaded:
+        failures.append(f"heavy modules loaded: {', '.join(loaded)}")
+    if default_boot["loaded"]:
+        failures.append("default boot loaded: "
+                        f"{', '.join(default_boot['loaded'])}")
+    if any(status >= 500 for status in statuses.values()):
+        failures.append("a route failed")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    if not failures:
+        print("✓ Startup within budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
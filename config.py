@@ -9,5 +9,55 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret")
     ENV = os.getenv("FLASK_ENV", "production")
 
+    # Scenario storage (SQLite)
+    SCENARIO_DB = os.getenv("SCENARIO_DB", "scenarios/scenarios.db")
+
+    # Sentence lexer backend: "antlr", "fast" or "parity"
+    LEXER_BACKEND = os.getenv("LEXER_BACKEND", "antlr")
+
+    # Parser prediction: "sll_first" (SLL, LL fallback) or "ll"
+    PARSE_PREDICTION = os.getenv("PARSE_PREDICTION", "sll_first")
+
+    # LRU cache of analyze_sentence() results (0 disables caching)
+    ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "1024"))
+
+    # Scoring rubric (reloaded when the file changes)
+    RUBRIC_PATH = os.getenv("RUBRIC_PATH", "analysis/rubric.json")
+
+    # Warm the ANTLR DFAs in create_app(); the cache file lets new
+    # workers load them instead of re-simulating ("" disables the file)
+    ANALYSIS_WARMUP = os.getenv("ANALYSIS_WARMUP", "1") == "1"
+    ANTLR_DFA_CACHE = os.getenv("ANTLR_DFA_CACHE", "analysis/dfa_cache.pickle")
+
+    # Validated model sentences shared by all workers (SQLite);
+    # TTL in seconds, size 0 disables the cache
+    MODEL_EXAMPLE_DB = os.getenv("MODEL_EXAMPLE_DB", "scenarios/model_examples.db")
+    MODEL_EXAMPLE_TTL = float(os.getenv("MODEL_EXAMPLE_TTL", str(7 * 24 * 3600)))
+    MODEL_EXAMPLE_CACHE_SIZE = int(os.getenv("MODEL_EXAMPLE_CACHE_SIZE", "10000"))
+
+    # Sentences pre-generated per scenario when it is created or the
+    # default scenarios change (0 turns pre-generation off)
+    MODEL_EXAMPLE_POOL_SIZE = int(os.getenv("MODEL_EXAMPLE_POOL_SIZE", "3"))
+
+    # Model sentences are generated in the background; after the
+    # deadline (seconds) the page shows the built-in fallback
+    MODEL_EXAMPLE_WORKERS = int(os.getenv("MODEL_EXAMPLE_WORKERS", "4"))
+    MODEL_EXAMPLE_DEADLINE = float(os.getenv("MODEL_EXAMPLE_DEADLINE", "10"))
+
     # OpenAI
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+    # Seconds per OpenAI call, and for all attempts of one model
+    # sentence on the request path
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "5"))
+    OPENAI_DEADLINE = float(os.getenv("OPENAI_DEADLINE", "8"))
+
+    # Shared keep-alive connection pool of the OpenAI clients
+    OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    OPENAI_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_KEEPALIVE_CONNECTIONS", "10"))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+
+    # Circuit breaker: open after this many failed calls in a row,
+    # try again after LLM_BREAKER_RESET seconds
+    LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+    LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
@@ -6,10 +6,17 @@ Analyzer is the SINGLE SOURCE OF TRUTH for scoring.
 Designed for children aged 6–10.
 """
 
-from openai import OpenAI
-from analysis.analyzer import analyze_sentence
+import sqlite3
+import time
 
-client = OpenAI()
+from analysis.analyzer import analyze_sentence, get_analyzer, normalize_answer
+from analysis.frozen import freeze
+from config import Config
+from logic.llm_client import get_client, llm_breaker, pregeneration_breaker
+from logic.model_example_cache import example_key, model_examples
+from logic.model_example_jobs import model_example_jobs
+
+MODEL_EXAMPLE_MODEL = "gpt-4o-mini"
 
 
 class ResponseEvaluator:
@@ -19,69 +26,27 @@ class ResponseEvaluator:
     - Rule-based, child-friendly feedback
     - Grammar- and context-driven MODEL examples (not rewrites)
     - Multi-layer validation for AI output
+
+    All tables are frozen in __init__; the module keeps one shared
+    instance for every request.
     """
 
-    def __init__(self):
-        self.client = client
+    @property
+    def client(self):
+        # Created on first use, not at import (see llm_client.py)
+        return get_client()
 
-        # =====================================================
-        # GRAMMAR RUBRIC PER GOAL (AUTHORITATIVE)
-        # =====================================================
-        self.grammar_rubric = {
-            "giving_feedback": {
-                "required": [
-                    "GREETING",
-                    "POSITIVE_COMMENT",
-                    "EMPATHY",
-                    "GENTLE_SUGGESTION"
-                ],
-                "description":
-                    "Say something nice, show understanding, and suggest improvement gently."
-            },
-            "expressing_disagreement": {
-                "required": [
-                    "ACKNOWLEDGEMENT",
-                    "HEDGE",
-                    "ALTERNATIVE_IDEA"
-                ],
-                "description":
-                    "Respect the idea first, then share a different opinion politely."
-            },
-            "polite_refusal": {
-                "required": [
-                    "THANK_YOU",
-                    "REASON",
-                    "ALTERNATIVE_TIME"
-                ],
-                "description":
-                    "Say thank you, explain kindly, and suggest another time."
-            },
-            "apologizing": {
-                "required": [
-                    "APOLOGY",
-                    "RESPONSIBILITY",
-                    "EMPATHY",
-                    "PROMISE"
-                ],
-                "description":
-                    "Say sorry clearly, show understanding, and promise to do better."
-            },
-            "asking_for_help": {
-                "required": [
-                    "GREETING",
-                    "POLITE_REQUEST",
-                    "CLARITY",
-                    "THANK_YOU"
-                ],
-                "description":
-                    "Ask politely, explain clearly, and say thank you."
-            }
-        }
+    @property
+    def grammar_rubric(self):
+        # Required components + description per goal for the model
+        # sentence prompt: "model_examples" in analysis/rubric.json
+        return get_analyzer().rubric.get().model_examples
 
+    def __init__(self):
         # =====================================================
         # SAFE FALLBACK MODEL SENTENCES (100% VERIFIED)
         # =====================================================
-        self.fallback_examples = {
+        self.fallback_examples = freeze({
             "giving_feedback":
                 "Hi Alex, I really like your work, and I understand accidents happen. Maybe next time we can be more careful together.",
             "expressing_disagreement":
@@ -92,7 +57,23 @@ class ResponseEvaluator:
                 "I am really sorry for what I said earlier, and I understand it hurt your feelings. I will be more careful next time.",
             "asking_for_help":
                 "Hi, could you please help me with this problem? Thank you so much!"
-        }
+        })
+
+        # =====================================================
+        # ENCOURAGEMENT PER GOAL
+        # =====================================================
+        self.encouragement = freeze({
+            "giving_feedback":
+                "🎯 Be kind and focus on helping, not blaming.",
+            "expressing_disagreement":
+                "🤝 Sharing ideas politely helps teamwork.",
+            "polite_refusal":
+                "🤍 Saying no kindly keeps friendships strong.",
+            "apologizing":
+                "🙏 A sincere apology helps fix mistakes.",
+            "asking_for_help":
+                "🆘 Polite asking makes people happy to help."
+        })
 
     # =====================================================
     # PUBLIC ENTRY POINT
@@ -101,10 +82,15 @@ class ResponseEvaluator:
         self,
         user_answer: str,
         scenario_goal: str,
-        scenario_context: dict
+        scenario_context: dict,
+        defer_example: bool = False
     ) -> dict:
         """
         Full evaluation pipeline.
+
+        defer_example: do not wait for the AI model sentence. A cached
+        one is returned right away; otherwise "improvement_example" is
+        None and "example_job" is the id to poll (model_example_jobs).
         """
 
         # ============================
@@ -123,11 +109,27 @@ class ResponseEvaluator:
         # STEP 3: Generate MODEL example (if needed)
         # ============================
         model_example = None
+        example_job = None
         if analysis["overall_score"] < 70:
-            model_example = self._generate_model_example(
-                goal=scenario_goal,
-                context=scenario_context
-            )
+            if defer_example:
+                model_example = self.cached_model_example(
+                    scenario_goal, scenario_context
+                )
+                if model_example is None and not llm_breaker.available():
+                    # AI is down: no job, no polling
+                    model_example = self.fallback_examples.get(scenario_goal)
+                if model_example is None:
+                    example_job = model_example_jobs.submit(
+                        lambda: self._generate_model_example(
+                            scenario_goal, scenario_context, use_cache=False
+                        ),
+                        self.fallback_examples.get(scenario_goal)
+                    )
+            else:
+                model_example = self._generate_model_example(
+                    goal=scenario_goal,
+                    context=scenario_context
+                )
 
         return {
             "user_answer": user_answer,
@@ -138,6 +140,7 @@ class ResponseEvaluator:
             "weaknesses": analysis.get("weaknesses", []),
             "feedback": feedback,
             "improvement_example": model_example,
+            "example_job": example_job,
             "analysis": analysis
         }
 
@@ -166,18 +169,7 @@ class ResponseEvaluator:
         if weaknesses:
             suggestion = "💡 You could add a little more understanding or a gentle suggestion."
 
-        encouragement = {
-            "giving_feedback":
-                "🎯 Be kind and focus on helping, not blaming.",
-            "expressing_disagreement":
-                "🤝 Sharing ideas politely helps teamwork.",
-            "polite_refusal":
-                "🤍 Saying no kindly keeps friendships strong.",
-            "apologizing":
-                "🙏 A sincere apology helps fix mistakes.",
-            "asking_for_help":
-                "🆘 Polite asking makes people happy to help."
-        }.get(goal, "⭐ Keep practicing!")
+        encouragement = self.encouragement.get(goal, "⭐ Keep practicing!")
 
         return {
             "praise": praise,
@@ -189,20 +181,172 @@ class ResponseEvaluator:
     # =====================================================
     # GRAMMAR + CONTEXT DRIVEN MODEL EXAMPLE (4-LAYER SAFE)
     # =====================================================
-    def _generate_model_example(self, goal: str, context: dict) -> str:
+    def cached_model_example(self, goal: str, context: dict):
+        """
+        Model sentence available without calling the AI: the cached
+        validated sentence, the fallback for goals without a rubric
+        entry, or None.
+        """
+        rubric = self.grammar_rubric.get(goal)
+        if not rubric:
+            return self.fallback_examples.get(goal)
+        return self._cached_example(
+            example_key(MODEL_EXAMPLE_MODEL,
+                        self._model_example_prompt(goal, rubric, context))
+        )
+
+    def _generate_model_example(self, goal: str, context: dict,
+                                use_cache: bool = True) -> str:
         """
         Generate an IDEAL model sentence that:
         - Fits scenario context
         - Satisfies grammar rubric
         - Passes analyzer validation
-        - Falls back safely if AI fails
+        - Falls back safely if AI fails (at once while the circuit
+          breaker is open; within OPENAI_DEADLINE otherwise)
+
+        Validated sentences are cached on disk per prompt (scenario +
+        goal + requirements, see model_example_cache.py); fallbacks are
+        not, so the next answer tries the AI again.
         """
 
         rubric = self.grammar_rubric.get(goal)
         if not rubric:
             return self.fallback_examples.get(goal)
 
-        prompt = f"""
+        prompt = self._model_example_prompt(goal, rubric, context)
+
+        key = example_key(MODEL_EXAMPLE_MODEL, prompt)
+        if use_cache:
+            cached = self._cached_example(key)
+            if cached:
+                return cached
+
+        # ============================
+        # AI ATTEMPTS (MAX 2 TRIES)
+        # ============================
+        deadline = time.monotonic() + Config.OPENAI_DEADLINE
+        for _ in range(2):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # An open breaker refuses (and counts) the call in allow()
+            sentence = self._ask_model(
+                prompt, goal, temperature=0.4,
+                timeout=min(Config.OPENAI_TIMEOUT, remaining)
+            )
+            if sentence:
+                self._store_example(key, goal, sentence)
+                return sentence
+            if not llm_breaker.available():
+                break
+
+        # ============================
+        # FINAL FALLBACK (GUARANTEED SAFE)
+        # ============================
+        return self.fallback_examples.get(goal)
+
+    def fill_example_pool(self, goal: str, context: dict, size: int) -> int:
+        """
+        Top the scenario's sentence pool up to `size` validated
+        sentences (at most 2 AI calls per missing one). Runs in the
+        background after scenarios are created or changed, so feedback
+        is served from the pool without calling the AI. Returns the
+        number of sentences added.
+        """
+        rubric = self.grammar_rubric.get(goal)
+        # Nothing could be stored: every AI call would be wasted
+        if not rubric or size <= 0 or model_examples.maxsize <= 0:
+            return 0
+
+        prompt = self._model_example_prompt(goal, rubric, context)
+        key = example_key(MODEL_EXAMPLE_MODEL, prompt)
+        try:
+            missing = wanted = size - model_examples.count(key)
+            attempts = 2 * wanted
+            while (missing > 0 and attempts > 0
+                   and pregeneration_breaker.available()):
+                attempts -= 1
+                # Warmer than on the request path: the pool should vary.
+                # Own breaker: background failures must not make the
+                # request path give up on the AI
+                sentence = self._ask_model(
+                    prompt, goal, temperature=0.8,
+                    breaker=pregeneration_breaker
+                )
+                if sentence:
+                    model_examples.put(key, goal, sentence)
+                    # Duplicates do not grow the pool
+                    missing = size - model_examples.count(key)
+        except sqlite3.Error as e:
+            print(f"Model example cache error: {e}")
+            return 0
+
+        return max(0, wanted - max(0, missing))
+
+    def _ask_model(self, prompt: str, goal: str, temperature: float,
+                   timeout: float = None, breaker=llm_breaker):
+        """
+        One AI attempt: the sentence if it passes validation, else None.
+        Goes through the circuit breaker; only failed API calls (errors,
+        timeouts) count against it, rejected sentences do not.
+        """
+        if not breaker.allow():
+            return None
+
+        try:
+            response = self.client.chat.completions.create(
+                model=MODEL_EXAMPLE_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a kind primary school teacher."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=80,
+                timeout=timeout or Config.OPENAI_TIMEOUT
+            )
+        except Exception as e:
+            breaker.record_failure()
+            print(f"AI error: {e}")
+            return None
+
+        breaker.record_success()
+
+        try:
+            sentence = response.choices[0].message.content.strip()
+
+            if not sentence:
+                return None
+
+            # ============================
+            # STEP 4: Analyzer validates AI sentence
+            # ============================
+            # Score and style only: no lexing, and one-off AI
+            # sentences stay out of the answer cache
+            ai_analysis = get_analyzer().score_text(
+                normalize_answer(sentence), goal
+            )
+
+            if (
+                ai_analysis["overall_score"] >= 80
+                and ai_analysis["style"] in ("polite", "very_polite")
+            ):
+                return sentence
+
+        except Exception as e:
+            print(f"AI error: {e}")
+
+        return None
+
+    @staticmethod
+    def _model_example_prompt(goal: str, rubric: dict, context: dict) -> str:
+        return f"""
 You are a primary school teacher helping children aged 6–10
 learn kind and polite communication.
 
@@ -235,65 +379,71 @@ RULES:
 - DO NOT use quotation marks
 """
 
-        # ============================
-        # AI ATTEMPTS (MAX 2 TRIES)
-        # ============================
-        for _ in range(2):
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a kind primary school teacher."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=0.4,
-                    max_tokens=80
-                )
+    @staticmethod
+    def _cached_example(key: str):
+        try:
+            return model_examples.get(key)
+        except sqlite3.Error as e:
+            print(f"Model example cache error: {e}")
+            return None
 
-                sentence = response.choices[0].message.content.strip()
+    @staticmethod
+    def _store_example(key: str, goal: str, sentence: str):
+        try:
+            model_examples.put(key, goal, sentence)
+        except sqlite3.Error as e:
+            print(f"Model example cache error: {e}")
 
-                if not sentence:
-                    continue
 
-                # ============================
-                # STEP 4: Analyzer validates AI sentence
-                # ============================
-                ai_analysis = analyze_sentence(sentence, goal)
+# =====================================================
+# SHARED INSTANCE + COMPATIBILITY WRAPPER
+# =====================================================
+_evaluator = ResponseEvaluator()
 
-                if (
-                    ai_analysis["overall_score"] >= 80
-                    and ai_analysis["style"] in ("polite", "very_polite")
-                ):
-                    return sentence
 
-            except Exception as e:
-                print(f"AI error: {e}")
+def evaluate_user_response(user_answer: str, scenario: dict,
+                           defer_example: bool = False) -> dict:
+    return _evaluator.evaluate_response(
+        user_answer=user_answer,
+        scenario_goal=scenario["goal"],
+        scenario_context=_scenario_context(scenario),
+        defer_example=defer_example
+    )
 
-        # ============================
-        # FINAL FALLBACK (GUARANTEED SAFE)
-        # ============================
-        return self.fallback_examples.get(goal)
 
-# =====================================================
-# COMPATIBILITY WRAPPER
-# =====================================================
-def evaluate_user_response(user_answer: str, scenario: dict) -> dict:
-    evaluator = ResponseEvaluator()
+def fill_example_pool(scenario: dict, size: int) -> int:
+    return _evaluator.fill_example_pool(
+        scenario["goal"], _scenario_context(scenario), size
+    )
 
-    context = {
+
+def poll_model_example(job_id: str, scenario: dict) -> dict:
+    """
+    State of a deferred model sentence (see ModelExampleJobs.poll).
+    Jobs of another worker process are answered from the shared disk
+    cache and stay pending until their deadline; after it, or for
+    unknown ids, the fallback is returned.
+    """
+    result = model_example_jobs.poll(job_id)
+    if result is not None:
+        return result
+
+    fallback = _evaluator.fallback_examples.get(scenario["goal"])
+    example = _evaluator.cached_model_example(
+        scenario["goal"], _scenario_context(scenario)
+    )
+    if example == fallback:
+        example = None
+
+    result = model_example_jobs.remote_status(job_id, example)
+    if result is not None:
+        return result
+    return {"status": "ready", "example": fallback, "source": "fallback"}
+
+
+def _scenario_context(scenario: dict) -> dict:
+    return {
         "title": scenario["title"],
         "story": scenario["story"],
         "question": scenario["question"]
     }
-
-    return evaluator.evaluate_response(
-        user_answer=user_answer,
-        scenario_goal=scenario["goal"],
-        scenario_context=context
-    )
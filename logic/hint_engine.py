@@ -4,22 +4,27 @@ Templates are prioritized; AI is used only when necessary.
 """
 
 import random
-from openai import OpenAI
 
-client = OpenAI()
+from analysis.frozen import freeze
+from logic.llm_client import get_client
 
 
 class HintEngine:
     """
     Engine for generating improvement hints
     in a child-friendly and educational way.
+
+    Tables are frozen in __init__ and the instance is shared.
     """
 
-    def __init__(self):
-        self.client = client
+    @property
+    def client(self):
+        # Created on first use, not at import (see llm_client.py)
+        return get_client()
 
+    def __init__(self):
         # Hint templates grouped by communication goal
-        self.hint_templates = {
+        self.hint_templates = freeze({
             "giving_feedback": {
                 "missing_softening": [
                     "💡 Try adding 'I think...' or 'Maybe...' before giving feedback!",
@@ -88,7 +93,71 @@ class HintEngine:
                     "💡 Clear requests get better help."
                 ]
             }
-        }
+        })
+
+        # Messages for excellent responses
+        self.excellence_messages = freeze({
+            "giving_feedback":
+                "🌟 Excellent! Your feedback is kind and thoughtful.",
+            "polite_refusal":
+                "🌟 Perfect! Your refusal is very polite and respectful.",
+            "apologizing":
+                "🌟 Great job! Your apology sounds sincere.",
+            "asking_for_help":
+                "🌟 Well done! You asked for help very politely."
+        })
+
+        # Short tips per goal
+        self.goal_tips = freeze({
+            "giving_feedback": [
+                "🎯 Formula: Praise + Suggestion + Encouragement",
+                "🎯 Use 'I think...' instead of blaming",
+                "🎯 Focus on solutions, not mistakes"
+            ],
+            "polite_refusal": [
+                "🎯 Formula: Thank + Reason + Alternative",
+                "🎯 Explain your reason clearly",
+                "🎯 Suggest another time"
+            ],
+            "apologizing": [
+                "🎯 Formula: Apology + Empathy + Promise",
+                "🎯 Say clearly what you are sorry for",
+                "🎯 Show you understand the other person"
+            ],
+            "asking_for_help": [
+                "🎯 Formula: Greeting + Polite request + Thank you",
+                "🎯 Use 'Could you...' instead of commands",
+                "🎯 Explain what help you need"
+            ]
+        })
+
+        # Example phrases per goal
+        self.example_phrases = freeze({
+            "giving_feedback": [
+                "I think maybe...",
+                "You could try...",
+                "In my opinion...",
+                "Perhaps we can..."
+            ],
+            "polite_refusal": [
+                "Thank you for inviting me, but...",
+                "I would love to, but...",
+                "Maybe another day!",
+                "How about next time?"
+            ],
+            "apologizing": [
+                "I’m sorry about...",
+                "I didn’t mean to...",
+                "I understand you feel...",
+                "I will try to..."
+            ],
+            "asking_for_help": [
+                "Could you help me?",
+                "Please help me...",
+                "I need help with...",
+                "Thank you very much!"
+            ]
+        })
 
     def generate_hint(
         self,
@@ -127,19 +196,8 @@ class HintEngine:
     def _generate_excellence_hint(self, goal: str) -> dict:
         """Hint for excellent responses."""
 
-        excellence_messages = {
-            "giving_feedback":
-                "🌟 Excellent! Your feedback is kind and thoughtful.",
-            "polite_refusal":
-                "🌟 Perfect! Your refusal is very polite and respectful.",
-            "apologizing":
-                "🌟 Great job! Your apology sounds sincere.",
-            "asking_for_help":
-                "🌟 Well done! You asked for help very politely."
-        }
-
         return {
-            "hint_text": excellence_messages.get(
+            "hint_text": self.excellence_messages.get(
                 goal,
                 "🌟 Excellent! Your sentence is very good."
             ),
@@ -178,71 +236,24 @@ class HintEngine:
             if "Missing softening words" in weakness and "missing_softening" in templates:
                 return random.choice(templates["missing_softening"])
 
-        first_key = list(templates.keys())[0]
+        first_key = next(iter(templates))
         return random.choice(templates[first_key])
 
     def _get_goal_tips(self, goal: str) -> list:
         """Return short tips based on the communication goal."""
 
-        tips_map = {
-            "giving_feedback": [
-                "🎯 Formula: Praise + Suggestion + Encouragement",
-                "🎯 Use 'I think...' instead of blaming",
-                "🎯 Focus on solutions, not mistakes"
-            ],
-            "polite_refusal": [
-                "🎯 Formula: Thank + Reason + Alternative",
-                "🎯 Explain your reason clearly",
-                "🎯 Suggest another time"
-            ],
-            "apologizing": [
-                "🎯 Formula: Apology + Empathy + Promise",
-                "🎯 Say clearly what you are sorry for",
-                "🎯 Show you understand the other person"
-            ],
-            "asking_for_help": [
-                "🎯 Formula: Greeting + Polite request + Thank you",
-                "🎯 Use 'Could you...' instead of commands",
-                "🎯 Explain what help you need"
-            ]
-        }
-
-        return tips_map.get(
+        return list(self.goal_tips.get(
             goal,
             ["💡 Greetings and thank-yous are always helpful."]
-        )[:2]
+        )[:2])
 
     def _get_example_phrases(self, goal: str) -> list:
         """Return example phrases for the goal."""
 
-        phrases_map = {
-            "giving_feedback": [
-                "I think maybe...",
-                "You could try...",
-                "In my opinion...",
-                "Perhaps we can..."
-            ],
-            "polite_refusal": [
-                "Thank you for inviting me, but...",
-                "I would love to, but...",
-                "Maybe another day!",
-                "How about next time?"
-            ],
-            "apologizing": [
-                "I’m sorry about...",
-                "I didn’t mean to...",
-                "I understand you feel...",
-                "I will try to..."
-            ],
-            "asking_for_help": [
-                "Could you help me?",
-                "Please help me...",
-                "I need help with...",
-                "Thank you very much!"
-            ]
-        }
+        return list(self.example_phrases.get(goal, ())[:3])
+
 
-        return phrases_map.get(goal, [])[:3]
+_engine = HintEngine()
 
 
 def get_smart_hint(
@@ -253,5 +264,4 @@ def get_smart_hint(
     """
     Compatibility wrapper for existing code.
     """
-    engine = HintEngine()
-    return engine.generate_hint(user_answer, scenario, evaluation)
+    return _engine.generate_hint(user_answer, scenario, evaluation)
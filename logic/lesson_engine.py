@@ -4,16 +4,20 @@ lesson_engine.py - Generate personalized lessons for children
 
 import random
 
+from analysis.frozen import freeze
+
 
 class LessonEngine:
     """
     Engine for generating personalized lessons
     suitable for children aged 6–10.
+
+    Tables are frozen in __init__ and the instance is shared.
     """
 
     def __init__(self):
         # Lessons grouped by communication goal
-        self.lessons = {
+        self.lessons = freeze({
             "giving_feedback": {
                 "title": "💬 Giving Kind Feedback",
                 "principle": (
@@ -96,10 +100,10 @@ class LessonEngine:
                         "Thank you very much!\""
                 }
             }
-        }
+        })
 
         # Key principles for each goal
-        self.key_principles = {
+        self.key_principles = freeze({
             "giving_feedback":
                 "🎯 Feedback = Praise + Suggestion + Encouragement",
             "polite_refusal":
@@ -108,7 +112,50 @@ class LessonEngine:
                 "🙏 Apology = Responsibility + Empathy + Promise",
             "asking_for_help":
                 "🆘 Asking for help = Greeting + Politeness + Clarity + Thanks"
-        }
+        })
+
+        # Practice tips for each goal
+        self.practice_tips = freeze({
+            "giving_feedback": [
+                "📝 Practice: Praise one thing + suggest one improvement",
+                "🎮 Role-play: Give feedback on a drawing",
+                "👥 Practice with parents: Comment on a meal"
+            ],
+            "polite_refusal": [
+                "📝 Practice: Refuse an invitation politely",
+                "🎮 Role-play: Practice saying no kindly",
+                "👥 Practice with friends: Invite and refuse gently"
+            ],
+            "apologizing": [
+                "📝 Practice: Write a short apology note",
+                "🎮 Scenario: What if you break a friend’s item?",
+                "👥 Practice at home: Apologize for forgetting chores"
+            ],
+            "asking_for_help": [
+                "📝 Practice: Ask for help with homework",
+                "🎮 Scenario: Ask for help in a game",
+                "👥 Practice: Ask parents for small help"
+            ]
+        })
+
+        # Lesson used when the goal is unknown
+        self.default_lesson = freeze({
+            "title": "💬 Good Communication",
+            "principle":
+                "Speaking politely helps people like and respect you!",
+            "steps": [
+                "1️⃣ Always greet others",
+                "2️⃣ Say thank you and sorry",
+                "3️⃣ Use gentle words",
+                "4️⃣ Listen to others"
+            ],
+            "examples": {
+                "bad":
+                    "❌ \"No! I don’t like it!\"",
+                "good":
+                    "✅ \"I’m sorry, I can’t do that. Thank you anyway!\""
+            }
+        })
 
     def generate_lesson(
         self,
@@ -265,54 +312,18 @@ class LessonEngine:
     def _get_practice_tips(self, goal: str) -> list:
         """Return practice tips for the goal."""
 
-        tips = {
-            "giving_feedback": [
-                "📝 Practice: Praise one thing + suggest one improvement",
-                "🎮 Role-play: Give feedback on a drawing",
-                "👥 Practice with parents: Comment on a meal"
-            ],
-            "polite_refusal": [
-                "📝 Practice: Refuse an invitation politely",
-                "🎮 Role-play: Practice saying no kindly",
-                "👥 Practice with friends: Invite and refuse gently"
-            ],
-            "apologizing": [
-                "📝 Practice: Write a short apology note",
-                "🎮 Scenario: What if you break a friend’s item?",
-                "👥 Practice at home: Apologize for forgetting chores"
-            ],
-            "asking_for_help": [
-                "📝 Practice: Ask for help with homework",
-                "🎮 Scenario: Ask for help in a game",
-                "👥 Practice: Ask parents for small help"
-            ]
-        }
-
-        return tips.get(
+        return list(self.practice_tips.get(
             goal,
             ["💡 Practice every day to improve!"]
-        )
+        ))
 
     def _get_default_lesson(self) -> dict:
         """Default lesson if goal is unknown."""
 
-        return {
-            "title": "💬 Good Communication",
-            "principle":
-                "Speaking politely helps people like and respect you!",
-            "steps": [
-                "1️⃣ Always greet others",
-                "2️⃣ Say thank you and sorry",
-                "3️⃣ Use gentle words",
-                "4️⃣ Listen to others"
-            ],
-            "examples": {
-                "bad":
-                    "❌ \"No! I don’t like it!\"",
-                "good":
-                    "✅ \"I’m sorry, I can’t do that. Thank you anyway!\""
-            }
-        }
+        return self.default_lesson
+
+
+_engine = LessonEngine()
 
 
 def get_personalized_lesson(
@@ -324,5 +335,4 @@ def get_personalized_lesson(
     Compatibility wrapper for existing code.
     """
 
-    engine = LessonEngine()
-    return engine.generate_lesson(user_answer, scenario, evaluation)
+    return _engine.generate_lesson(user_answer, scenario, evaluation)
@@ -0,0 +1,204 @@
+"""
+llm_client.py - Lazily created, shared OpenAI clients + circuit breaker
+
+Importing `openai` takes most of a second and constructing the client
+needs OPENAI_API_KEY, so neither happens until the first request that
+actually calls the model. Every engine uses the same client, and so
+the same HTTP connection pool:
+
+- get_client(): the process-wide sync client
+- get_async_client(): an AsyncOpenAI client for the running event loop
+  (async connections cannot be shared between loops, so there is one
+  per loop)
+
+Both use Config.OPENAI_API_KEY and a keep-alive pool sized by
+OPENAI_MAX_CONNECTIONS / OPENAI_KEEPALIVE_CONNECTIONS, so repeated
+calls skip the TCP and TLS handshakes.
+
+The clients have a hard per-call timeout (OPENAI_TIMEOUT) and no SDK
+retries: callers retry themselves within their own deadline. All calls
+go through a circuit breaker: after LLM_BREAKER_FAILURES failures in a
+row it opens and callers use their fallbacks without waiting; after
+LLM_BREAKER_RESET seconds one trial call is let through (half-open)
+and decides whether it closes again. `llm_breaker` guards the request
+path, `pregeneration_breaker` the background pool filling, so
+background failures never block feedback requests.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+
+from config import Config
+
+_client = None
+_async_clients = weakref.WeakKeyDictionary()   # event loop -> client
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import DefaultHttpxClient, OpenAI
+                _client = OpenAI(
+                    api_key=Config.OPENAI_API_KEY,
+                    timeout=Config.OPENAI_TIMEOUT,
+                    max_retries=0,
+                    http_client=DefaultHttpxClient(limits=_pool_limits())
+                )
+    return _client
+
+
+def get_async_client():
+    """
+    Return the AsyncOpenAI client of the running event loop (call it
+    from a coroutine), creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        with _client_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+                client = AsyncOpenAI(
+                    api_key=Config.OPENAI_API_KEY,
+                    timeout=Config.OPENAI_TIMEOUT,
+                    max_retries=0,
+                    http_client=DefaultAsyncHttpxClient(limits=_pool_limits())
+                )
+                _async_clients[loop] = client
+    return client
+
+
+def _pool_limits():
+    # HTTP package of the installed openai SDK (httpx, or httpx2 in
+    # newer releases)
+    try:
+        from httpx2 import Limits
+    except ImportError:
+        from httpx import Limits
+    return Limits(
+        max_connections=Config.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.OPENAI_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.OPENAI_KEEPALIVE_EXPIRY
+    )
+
+
+# =====================================================
+# CIRCUIT BREAKER
+# =====================================================
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures,
+    open -> half_open once `reset_timeout` seconds have passed (one
+    trial call), half_open -> closed on success or open on failure.
+
+    allow() before a call, then record_success() / record_failure().
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+        # Counters for /metrics
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def available(self) -> bool:
+        """
+        Would a call be let through now? A read-only probe: it neither
+        takes the half-open trial nor counts as a rejection (only
+        allow() does).
+        """
+        with self._lock:
+            state = self._current_state()
+            return state == "closed" or (
+                state == "half_open" and not self._trial_running
+            )
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                self.calls += 1
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._state = "half_open"
+                self._trial_running = True
+                self.calls += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.opened += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == "open":
+                retry_in = round(
+                    self._opened_at + self.reset_timeout - time.monotonic(), 1
+                )
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                "retry_in_seconds": retry_in,
+                "calls": self.calls,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "opened": self.opened
+            }
+
+    def _current_state(self) -> str:
+        # Caller holds the lock
+        if (self._state == "open"
+                and time.monotonic() - self._opened_at >= self.reset_timeout):
+            return "half_open"
+        return self._state
+
+
+llm_breaker = CircuitBreaker(
+    failure_threshold=Config.LLM_BREAKER_FAILURES,
+    reset_timeout=Config.LLM_BREAKER_RESET
+)
+
+pregeneration_breaker = CircuitBreaker(
+    failure_threshold=Config.LLM_BREAKER_FAILURES,
+    reset_timeout=Config.LLM_BREAKER_RESET
+)
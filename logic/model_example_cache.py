@@ -0,0 +1,190 @@
+"""
+model_example_cache.py - Disk-backed pool of validated model sentences
+
+The model-sentence prompt depends only on the scenario (title, story,
+question), the goal and its rubric requirements - never on the child's
+answer. So validated sentences are stored in SQLite per prompt and
+served to every later low-scoring answer of that scenario instead of
+calling the LLM again:
+
+- key: sha256 of (model, prompt), so editing a scenario, its goal or
+  the rubric requirements starts a new entry; the goal is stored next
+  to it for inspection
+- each key holds a pool of up to `pool_size` different sentences
+  (filled ahead of time, see ResponseEvaluator.fill_example_pool);
+  get() picks one at random
+- entries expire after a TTL and the least recently used ones are
+  evicted above `maxsize` sentences
+- the database runs in WAL mode, so every worker process of the app
+  shares the same entries
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_example_pool (
+    key        TEXT NOT NULL,
+    sentence   TEXT NOT NULL,
+    goal       TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL,
+    PRIMARY KEY (key, sentence)
+);
+CREATE INDEX IF NOT EXISTS idx_model_example_pool_used
+    ON model_example_pool (last_used);
+CREATE INDEX IF NOT EXISTS idx_model_example_pool_created
+    ON model_example_pool (created_at);
+"""
+
+# last_used is only rewritten when older than this (seconds), so hot
+# entries do not turn every read into a write
+TOUCH_INTERVAL = 60
+
+
+def example_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class ModelExampleCache:
+    """
+    TTL + LRU pools of model sentences in one SQLite file.
+
+    One connection per thread; maxsize 0 disables the cache.
+    """
+
+    def __init__(self, db_path: str, ttl: float = 7 * 24 * 3600,
+                 maxsize: int = 10000, pool_size: int = 3):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.pool_size = max(1, pool_size)
+
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+        # Per-process counters (see stats())
+        self.hits = 0
+        self.misses = 0
+
+    # =====================================================
+    # READ / WRITE
+    # =====================================================
+    def get(self, key: str):
+        """A random sentence of the key's pool, or None if it is empty."""
+        if self.maxsize <= 0:
+            return None
+
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT sentence, last_used FROM model_example_pool "
+            "WHERE key = ? AND created_at >= ? ORDER BY random() LIMIT 1",
+            (key, now - self.ttl)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if row["last_used"] < now - TOUCH_INTERVAL:
+            with conn:
+                conn.execute(
+                    "UPDATE model_example_pool SET last_used = ? WHERE key = ?",
+                    (now, key)
+                )
+        return row["sentence"]
+
+    def count(self, key: str) -> int:
+        """Unexpired sentences in the key's pool."""
+        if self.maxsize <= 0:
+            return 0
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM model_example_pool "
+            "WHERE key = ? AND created_at >= ?",
+            (key, time.time() - self.ttl)
+        ).fetchone()[0]
+
+    def put(self, key: str, goal: str, sentence: str):
+        """Add a validated sentence, then drop expired / excess entries."""
+        if self.maxsize <= 0:
+            return
+
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO model_example_pool "
+                "(key, sentence, goal, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sentence, goal, now, now)
+            )
+            conn.execute(
+                "DELETE FROM model_example_pool WHERE created_at < ?",
+                (now - self.ttl,)
+            )
+            # Oldest sentences beyond the pool size of this key
+            conn.execute(
+                "DELETE FROM model_example_pool WHERE key = ? AND rowid IN ("
+                "SELECT rowid FROM model_example_pool WHERE key = ? "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (key, key, self.pool_size)
+            )
+            # Least recently used beyond maxsize
+            conn.execute(
+                "DELETE FROM model_example_pool WHERE rowid IN ("
+                "SELECT rowid FROM model_example_pool "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,)
+            )
+
+    def stats(self) -> dict:
+        size = self._connection().execute(
+            "SELECT COUNT(*) FROM model_example_pool"
+        ).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "pool_size": self.pool_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None
+        }
+
+    # =====================================================
+    # CONNECTION & SCHEMA
+    # =====================================================
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+        return conn
+
+
+# =====================================================
+# SHARED INSTANCE
+# =====================================================
+model_examples = ModelExampleCache(
+    Config.MODEL_EXAMPLE_DB,
+    ttl=Config.MODEL_EXAMPLE_TTL,
+    maxsize=Config.MODEL_EXAMPLE_CACHE_SIZE,
+    pool_size=Config.MODEL_EXAMPLE_POOL_SIZE
+)
@@ -0,0 +1,222 @@
+"""
+model_example_jobs.py - Background model-sentence generation
+
+The feedback page no longer waits for the model sentence (up to two
+OpenAI round trips plus an analyzer check). The evaluator submits the
+generation here and gets a job id back; the page renders at once and
+polls /feedback/<scenario_id>/example/<job_id> until it is ready.
+
+A job that is not done DEADLINE seconds after it was submitted is
+answered with the built-in fallback sentence. The generation itself
+keeps running: if it succeeds, the sentence still lands in the disk
+cache and the next answer gets it without waiting.
+
+The futures live in this process only, but the job id carries its
+submit time (wall clock, "<ms hex>-<token>"). A poll that reaches
+another worker process is answered from the shared disk cache, where
+the generating worker stores the sentence, and stays "pending" until
+the same deadline; only then is it given the fallback.
+
+PregenerationQueue fills the per-scenario sentence pools ahead of
+time (after a scenario is created or the default scenarios change), one
+scenario at a time on its own thread, so it never competes with the
+request-path jobs.
+"""
+
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+
+# How long finished / abandoned jobs can still be polled (seconds)
+KEEP_SECONDS = 300
+
+# Suggested delay between two polls of a pending job
+POLL_INTERVAL_MS = 500
+
+
+class ModelExampleJobs:
+    """
+    Job id -> running or finished generation.
+
+    submit(generate, fallback) starts generate() on the pool; poll(id)
+    never blocks.
+    """
+
+    def __init__(self, workers: int = 4, deadline: float = 10.0,
+                 keep: float = KEEP_SECONDS, max_jobs: int = 1000):
+        self.workers = workers
+        self.deadline = deadline
+        self.keep = keep
+        self.max_jobs = max_jobs
+
+        self._executor = None
+        self._jobs = {}     # id -> (future, fallback, submitted_at)
+        self._lock = threading.Lock()
+
+    def submit(self, generate, fallback: str) -> str:
+        job_id = f"{int(time.time() * 1000):x}-{secrets.token_urlsafe(12)}"
+        now = time.monotonic()
+
+        with self._lock:
+            if self._executor is None:
+                # Created on first use: booting starts no threads
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="model-example"
+                )
+            self._prune(now)
+            self._jobs[job_id] = (self._executor.submit(generate), fallback, now)
+        return job_id
+
+    def poll(self, job_id: str):
+        """
+        {"status": "ready", "example", "source": "ai" | "fallback"} or
+        {"status": "pending", "retry_ms"}; None for an unknown id.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        future, fallback, submitted_at = job
+
+        if future.done():
+            try:
+                example = future.result()
+            except Exception as e:
+                print(f"Model example job failed: {e}")
+                example = None
+            if example and example != fallback:
+                return {"status": "ready", "example": example, "source": "ai"}
+            return {"status": "ready", "example": fallback, "source": "fallback"}
+
+        if time.monotonic() - submitted_at >= self.deadline:
+            return {"status": "ready", "example": fallback, "source": "fallback"}
+
+        return {"status": "pending", "retry_ms": POLL_INTERVAL_MS}
+
+    def remote_status(self, job_id: str, cached: str = None) -> dict:
+        """
+        poll() for a job of another process: the cached sentence if the
+        generating worker stored one, else pending until the job's
+        deadline. None once it has passed (or for a malformed id).
+        """
+        if cached:
+            return {"status": "ready", "example": cached, "source": "cache"}
+
+        submitted_at = job_submitted_at(job_id)
+        if submitted_at is None:
+            return None
+        age = time.time() - submitted_at
+        if -self.deadline < age < self.deadline:
+            return {"status": "pending", "retry_ms": POLL_INTERVAL_MS}
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            futures = [job[0] for job in self._jobs.values()]
+        running = sum(1 for future in futures if not future.done())
+        return {
+            "tracked": len(futures),
+            "running": running,
+            "workers": self.workers,
+            "deadline_seconds": self.deadline
+        }
+
+    def _prune(self, now: float):
+        # Insertion order == submission order (caller holds the lock)
+        while self._jobs:
+            oldest = next(iter(self._jobs))
+            if (len(self._jobs) < self.max_jobs
+                    and now - self._jobs[oldest][2] < self.keep):
+                break
+            del self._jobs[oldest]
+
+
+def job_submitted_at(job_id: str):
+    """Wall-clock submit time encoded in a job id, or None."""
+    stamp, _, token = job_id.partition("-")
+    if not token:
+        return None
+    try:
+        return int(stamp, 16) / 1000
+    except ValueError:
+        return None
+
+
+class PregenerationQueue:
+    """
+    Background pool filling, one scenario at a time.
+
+    A scenario already queued (same content and goal) is not queued
+    twice; the fill itself skips pools that are already full.
+    """
+
+    def __init__(self, pool_size: int = 3, enabled: bool = True):
+        self.pool_size = pool_size
+        # Off without an API key or with the cache disabled: the calls
+        # could only fail, or their sentences could not be stored
+        self.enabled = enabled and pool_size > 0
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, scenarios) -> int:
+        """Queue pool filling for scenario dicts; returns how many."""
+        if not self.enabled:
+            return 0
+
+        queued = 0
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="model-example-pregen"
+                )
+            for scenario in scenarios:
+                name = (scenario["goal"], scenario["title"],
+                        scenario["story"], scenario["question"])
+                if name in self._pending:
+                    continue
+                self._pending.add(name)
+                self._executor.submit(self._fill, name, dict(scenario))
+                queued += 1
+        return queued
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending": len(self._pending),
+                "pool_size": self.pool_size
+            }
+
+    def _fill(self, name: tuple, scenario: dict):
+        try:
+            # Imported here: the evaluator loads the analyzer and ANTLR
+            from logic.evaluator import fill_example_pool
+            added = fill_example_pool(scenario, self.pool_size)
+            if added:
+                print(f"Pre-generated {added} model sentences for "
+                      f"scenario {scenario.get('id')}")
+        except Exception as e:
+            print(f"Error pre-generating model sentences: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(name)
+
+
+# =====================================================
+# SHARED INSTANCES
+# =====================================================
+model_example_jobs = ModelExampleJobs(
+    workers=Config.MODEL_EXAMPLE_WORKERS,
+    deadline=Config.MODEL_EXAMPLE_DEADLINE
+)
+
+pregeneration = PregenerationQueue(
+    pool_size=Config.MODEL_EXAMPLE_POOL_SIZE,
+    enabled=bool(Config.OPENAI_API_KEY) and Config.MODEL_EXAMPLE_CACHE_SIZE > 0
+)
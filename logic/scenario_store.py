@@ -0,0 +1,363 @@
+"""
+scenario_store.py - SQLite-backed scenario storage
+
+Scenarios live in one embedded SQLite database:
+- `id` is the INTEGER PRIMARY KEY (the rowid B-tree), so lookups by id
+  are a single index probe
+- `goal` has its own index for filtered listings
+- Custom scenarios are imported once from the legacy JSON file,
+  after that the database is the only source of truth for them
+- Default scenarios are re-synced whenever default_scenarios.json
+  changes on disk (mtime or size), so editing the file still works;
+  callbacks registered with on_defaults_synced() get the new list
+- ids never clash silently: a custom scenario holding an id that a
+  default needs is moved to a new id, never overwritten
+
+Seed the database ahead of the first request (e.g. during deployment):
+    python -m logic.scenario_store [--db PATH]
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from config import Config
+
+DEFAULT_PATH = "scenarios/default_scenarios.json"
+CUSTOM_PATH = "scenarios/custom_scenarios.json"
+
+# Custom scenario ids start here (defaults use the small numbers)
+FIRST_CUSTOM_ID = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id       INTEGER PRIMARY KEY,
+    title    TEXT NOT NULL,
+    story    TEXT NOT NULL,
+    question TEXT NOT NULL,
+    goal     TEXT NOT NULL,
+    source   TEXT NOT NULL CHECK (source IN ('default', 'custom'))
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_goal ON scenarios (goal, id);
+CREATE INDEX IF NOT EXISTS idx_scenarios_source ON scenarios (source, id);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+COLUMNS = "id, title, story, question, goal"
+
+
+class ScenarioStore:
+    """
+    Thin data-access layer over the scenario database.
+
+    One connection is opened per thread. Rows are returned as plain
+    dicts so templates and the evaluator keep working unchanged.
+    """
+
+    def __init__(self, db_path: str, default_path: str = DEFAULT_PATH,
+                 custom_path: str = CUSTOM_PATH):
+        self.db_path = db_path
+        self.default_path = default_path
+        self.custom_path = custom_path
+
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._default_signature = None
+        self._default_listeners = []
+
+    # =====================================================
+    # READ API
+    # =====================================================
+    def get_scenario(self, scenario_id: int):
+        """Return one scenario dict, or None."""
+        row = self._connection().execute(
+            f"SELECT {COLUMNS} FROM scenarios WHERE id = ?",
+            (scenario_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_default_scenarios(self) -> list:
+        return self._list("default")
+
+    def get_custom_scenarios(self) -> list:
+        return self._list("custom")
+
+    def get_page(self, source: str, goal: str = None,
+                 after_id: int = None, limit: int = 24) -> tuple:
+        """
+        Keyset (cursor) pagination ordered by id.
+
+        Returns (scenarios, next_cursor). next_cursor is the id to pass
+        as `after_id` for the following page, or None on the last page.
+        Only `limit + 1` rows are ever read, however large the table is.
+        """
+        sql = f"SELECT {COLUMNS} FROM scenarios WHERE source = ?"
+        params = [source]
+
+        if goal:
+            sql += " AND goal = ?"
+            params.append(goal)
+        if after_id is not None:
+            sql += " AND id > ?"
+            params.append(after_id)
+
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self._connection().execute(sql, params).fetchall()
+
+        scenarios = [dict(r) for r in rows[:limit]]
+        next_cursor = scenarios[-1]["id"] if len(rows) > limit else None
+        return scenarios, next_cursor
+
+    def get_goals(self) -> list:
+        """Distinct goals, read from the goal index."""
+        rows = self._connection().execute(
+            "SELECT DISTINCT goal FROM scenarios ORDER BY goal"
+        ).fetchall()
+        return [r["goal"] for r in rows]
+
+    # =====================================================
+    # WRITE API (custom scenarios only)
+    # =====================================================
+    def add_custom_scenario(self, title: str, story: str,
+                            question: str, goal: str) -> dict:
+        """Insert a custom scenario and return it with its new id."""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO scenarios (id, title, story, question, goal, source)
+                SELECT MAX(COALESCE(MAX(id) + 1, ?), ?), ?, ?, ?, ?, 'custom'
+                FROM scenarios
+                """,
+                (FIRST_CUSTOM_ID, FIRST_CUSTOM_ID,
+                 title, story, question, goal)
+            )
+        return self.get_scenario(cursor.lastrowid)
+
+    def on_defaults_synced(self, callback):
+        """
+        Call callback(scenarios) after default_scenarios.json was
+        (re-)imported. It runs on the request thread: hand real work
+        off to the background.
+        """
+        self._default_listeners.append(callback)
+
+    def delete_custom_scenario(self, scenario_id: int) -> bool:
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM scenarios WHERE id = ? AND source = 'custom'",
+                (scenario_id,)
+            )
+        return cursor.rowcount > 0
+
+    # =====================================================
+    # CONNECTION & SCHEMA
+    # =====================================================
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            self._initialize(conn)
+        else:
+            self._sync_defaults(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection):
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.executescript(SCHEMA)
+            self._sync_defaults(conn)
+            self._import_custom_once(conn)
+            self._initialized = True
+
+    def _list(self, source: str) -> list:
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM scenarios WHERE source = ? ORDER BY id",
+            (source,)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    # =====================================================
+    # JSON IMPORT
+    # =====================================================
+    def _sync_defaults(self, conn: sqlite3.Connection):
+        """
+        Re-import default scenarios when the JSON file changed.
+        Costs one os.stat() per call while nothing changes.
+
+        Defaults keep the ids from the JSON file. A custom scenario that
+        already holds one of those ids is moved to a new id instead of
+        being overwritten.
+        """
+        signature = self._stat(self.default_path)
+        if signature == self._default_signature:
+            return
+
+        stored = conn.execute(
+            "SELECT value FROM store_meta WHERE key = 'default_signature'"
+        ).fetchone()
+
+        if stored is None or stored["value"] != signature:
+            scenarios = self._load_json(self.default_path)
+            with conn:
+                conn.execute("DELETE FROM scenarios WHERE source = 'default'")
+                self._move_clashing_customs(
+                    conn, [scenario["id"] for scenario in scenarios]
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO scenarios
+                        (id, title, story, question, goal, source)
+                    VALUES (:id, :title, :story, :question, :goal, 'default')
+                    """,
+                    scenarios
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO store_meta (key, value) "
+                    "VALUES ('default_signature', ?)",
+                    (signature,)
+                )
+
+            for callback in self._default_listeners:
+                try:
+                    callback(scenarios)
+                except Exception as e:
+                    print(f"Error in default scenario listener: {e}")
+
+        self._default_signature = signature
+
+    @staticmethod
+    def _move_clashing_customs(conn: sqlite3.Connection, default_ids: list):
+        """Give custom scenarios that use a default id a fresh id."""
+        if not default_ids:
+            return
+        placeholders = ", ".join("?" * len(default_ids))
+        clashing = [row["id"] for row in conn.execute(
+            f"SELECT id FROM scenarios WHERE source = 'custom' "
+            f"AND id IN ({placeholders}) ORDER BY id",
+            default_ids
+        )]
+        if not clashing:
+            return
+
+        highest = conn.execute("SELECT MAX(id) FROM scenarios").fetchone()[0]
+        next_id = max(highest, max(default_ids), FIRST_CUSTOM_ID - 1) + 1
+        for old_id in clashing:
+            conn.execute(
+                "UPDATE scenarios SET id = ? WHERE id = ?", (next_id, old_id)
+            )
+            print(f"Custom scenario {old_id} clashes with a default "
+                  f"scenario id, moved to {next_id}")
+            next_id += 1
+
+    def _import_custom_once(self, conn: sqlite3.Connection):
+        """One-time import of the legacy custom_scenarios.json file."""
+        done = conn.execute(
+            "SELECT 1 FROM store_meta WHERE key = 'custom_imported'"
+        ).fetchone()
+        if done:
+            return
+
+        scenarios = self._load_json(self.custom_path)
+        with conn:
+            for scenario in scenarios:
+                taken = conn.execute(
+                    "SELECT 1 FROM scenarios WHERE id = ?", (scenario["id"],)
+                ).fetchone()
+                if taken:
+                    # Keep the scenario under a fresh id
+                    scenario = dict(scenario, id=conn.execute(
+                        "SELECT MAX(MAX(id) + 1, ?) FROM scenarios",
+                        (FIRST_CUSTOM_ID,)
+                    ).fetchone()[0])
+                conn.execute(
+                    """
+                    INSERT INTO scenarios
+                        (id, title, story, question, goal, source)
+                    VALUES (:id, :title, :story, :question, :goal, 'custom')
+                    """,
+                    scenario
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) "
+                "VALUES ('custom_imported', '1')"
+            )
+
+    @staticmethod
+    def _stat(path: str) -> str:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return "missing"
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    @staticmethod
+    def _load_json(path: str) -> list:
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+
+# =====================================================
+# SHARED INSTANCE
+# =====================================================
+store = ScenarioStore(Config.SCENARIO_DB)
+
+
+def get_scenario(scenario_id: int):
+    return store.get_scenario(scenario_id)
+
+
+def get_default_scenarios() -> list:
+    return store.get_default_scenarios()
+
+
+def get_custom_scenarios() -> list:
+    return store.get_custom_scenarios()
+
+
+def seed(db_path: str = None) -> dict:
+    """
+    Create the database and run the JSON imports now instead of on the
+    first request (e.g. during deployment). Returns the row counts.
+    """
+    target = ScenarioStore(db_path) if db_path else store
+    return {
+        "database": os.path.abspath(target.db_path),
+        "default": len(target.get_default_scenarios()),
+        "custom": len(target.get_custom_scenarios())
+    }
+
+
+if __name__ == "__main__":
+    # python -m logic.scenario_store [--db PATH]
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Create the scenario database and import the JSON files"
+    )
+    parser.add_argument("--db", default=None,
+                        help=f"database file (default: {Config.SCENARIO_DB})")
+    counts = seed(parser.parse_args().db)
+    print(f"Seeded {counts['database']}: {counts['default']} default, "
+          f"{counts['custom']} custom scenarios")
@@ -2,35 +2,22 @@
 feedback.py - Route for processing and displaying feedback
 """
 
-import json
-import os
-from flask import Blueprint, render_template, session, redirect, url_for
+from flask import Blueprint, jsonify, render_template, session, redirect, url_for
 
-from logic.evaluator import evaluate_user_response
-from logic.lesson_engine import get_personalized_lesson
-from logic.hint_engine import get_smart_hint
+from logic.scenario_store import get_scenario
 
 feedback_bp = Blueprint("feedback", __name__)
 
-DEFAULT_PATH = "scenarios/default_scenarios.json"
-CUSTOM_PATH = "scenarios/custom_scenarios.json"
-
 
 @feedback_bp.route("/feedback/<int:scenario_id>")
 def show_feedback(scenario_id):
+    # Imported here so the other routes boot without ANTLR or OpenAI
+    from logic.evaluator import evaluate_user_response
+    from logic.lesson_engine import get_personalized_lesson
+    from logic.hint_engine import get_smart_hint
 
-    scenarios = []
-
-    # ================= LOAD SCENARIOS =================
-    if os.path.exists(DEFAULT_PATH):
-        with open(DEFAULT_PATH, encoding="utf-8") as f:
-            scenarios.extend(json.load(f))
-
-    if os.path.exists(CUSTOM_PATH):
-        with open(CUSTOM_PATH, encoding="utf-8") as f:
-            scenarios.extend(json.load(f))
-
-    scenario = next((s for s in scenarios if s["id"] == scenario_id), None)
+    # ================= LOAD SCENARIO =================
+    scenario = get_scenario(scenario_id)
 
     if not scenario:
         return "Scenario not found", 404
@@ -45,7 +32,8 @@ def show_feedback(scenario_id):
         )
 
     # ================= STEP 1: EVALUATION =================
-    evaluation = evaluate_user_response(answer, scenario)
+    # The AI model sentence is not awaited: the page polls for it
+    evaluation = evaluate_user_response(answer, scenario, defer_example=True)
 
     # ================= STEP 2: LESSON =================
     lesson_data = get_personalized_lesson(
@@ -93,6 +81,7 @@ def show_feedback(scenario_id):
         # Feedback & example
         feedback=evaluation.get("feedback", {}),
         improvement_example=evaluation.get("improvement_example"),
+        example_job=evaluation.get("example_job"),
 
         # Lesson & hints
         lesson_data=lesson_data,
@@ -105,3 +94,18 @@ def show_feedback(scenario_id):
         # Backward compatibility
         detailed_scores=evaluation.get("detailed_scores", {})
     )
+
+
+@feedback_bp.route("/feedback/<int:scenario_id>/example/<job_id>")
+def model_example(scenario_id, job_id):
+    """
+    JSON state of a deferred model sentence: {"status": "pending",
+    "retry_ms"} or {"status": "ready", "example", "source"}.
+    """
+    from logic.evaluator import poll_model_example
+
+    scenario = get_scenario(scenario_id)
+    if not scenario:
+        return jsonify({"error": "Scenario not found"}), 404
+
+    return jsonify(poll_model_example(job_id, scenario))
@@ -1,29 +1,38 @@
-import json
-import os
-from flask import Blueprint, render_template
+from flask import Blueprint, request, stream_template
+
+from logic.scenario_store import store
 
 home_bp = Blueprint("home", __name__)
 
-DEFAULT_PATH = "scenarios/default_scenarios.json"
-CUSTOM_PATH = "scenarios/custom_scenarios.json"
+PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
 
 
 @home_bp.route("/")
 def home():
-    with open(DEFAULT_PATH, encoding="utf-8") as f:
-        default_scenarios = json.load(f)
+    goal = request.args.get("goal") or None
+    after_id = request.args.get("after", type=int)
+    limit = request.args.get("limit", PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
 
-    if os.path.exists(CUSTOM_PATH):
-        try:
-            with open(CUSTOM_PATH, encoding="utf-8") as f:
-                custom_scenarios = json.load(f)
-        except json.JSONDecodeError:
-            custom_scenarios = []
-    else:
-        custom_scenarios = []
+    # Defaults are only shown above the first page of custom scenarios
+    default_scenarios = []
+    if after_id is None:
+        default_scenarios, _ = store.get_page(
+            "default", goal=goal, limit=MAX_PAGE_SIZE
+        )
+    custom_scenarios, next_cursor = store.get_page(
+        "custom", goal=goal, after_id=after_id, limit=limit
+    )
 
-    return render_template(
+    # Streamed render: the page head is sent before the cards are built
+    return stream_template(
         "index.html",
         default_scenarios=default_scenarios,
-        custom_scenarios=custom_scenarios
+        custom_scenarios=custom_scenarios,
+        goals=store.get_goals(),
+        selected_goal=goal,
+        is_first_page=after_id is None,
+        next_cursor=next_cursor,
+        page_size=limit
     )
@@ -0,0 +1,62 @@
+"""
+live.py - JSON endpoint behind the as-you-type politeness meter
+"""
+
+import secrets
+import time
+
+from flask import Blueprint, jsonify, request, session
+
+from logic.scenario_store import get_scenario
+
+live_bp = Blueprint("live", __name__)
+
+# Same limit as the answer textarea
+MAX_LIVE_CHARS = 500
+
+
+@live_bp.route("/live/<int:scenario_id>", methods=["POST"])
+def live_analysis(scenario_id):
+    """
+    Re-score the current draft. Only the edited part of the text is
+    re-lexed (per-session IncrementalLexer); the rubric itself is a few
+    regexes over the text.
+    """
+    # Imported here so the other routes boot without the analyzer
+    from analysis.analyzer import get_analyzer, normalize_answer
+    from analysis.incremental_lexer import live_lexers
+    from analysis.parser_runner import get_token_categories
+
+    started = time.perf_counter()
+
+    scenario = get_scenario(scenario_id)
+    if scenario is None:
+        return jsonify({"error": "Scenario not found"}), 404
+
+    payload = request.get_json(silent=True) or {}
+    text = str(payload.get("text", ""))[:MAX_LIVE_CHARS]
+    text_lower = text.lower()
+
+    if "live_id" not in session:
+        session["live_id"] = secrets.token_hex(8)
+    lexer = live_lexers.get((session["live_id"], scenario_id))
+
+    tokens, errors = lexer.update(text_lower)
+    names = [lexer.lexer.symbolic_names[t[0]] for t in tokens[:-1]]
+    categories = get_token_categories(names)
+
+    # Same text the submitted answer is scored on (see analyze_sentence)
+    result = get_analyzer().score_text(normalize_answer(text), scenario["goal"])
+
+    return jsonify({
+        "overall_score": result["overall_score"],
+        "style": result["style"],
+        "sentiment": result["sentiment"],
+        "structure": result["structure"],
+        "categories": {k: len(v) for k, v in categories.items()},
+        "token_count": len(names),
+        "unknown_characters": len(errors),
+        "relexed_spans": lexer.relexed,
+        "reused_spans": lexer.reused,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    })
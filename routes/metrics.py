@@ -0,0 +1,54 @@
+"""
+metrics.py - JSON metrics: LLM circuit breaker, model sentence cache,
+analysis result cache and SLL/LL parse counts
+"""
+
+import sqlite3
+import sys
+
+from flask import Blueprint, jsonify
+
+from logic.llm_client import llm_breaker, pregeneration_breaker
+from logic.model_example_cache import model_examples
+from logic.model_example_jobs import model_example_jobs, pregeneration
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics")
+def metrics():
+    """
+    Per-process counters (each worker answers for itself); the cache
+    size is shared by all workers.
+    """
+    try:
+        cache = model_examples.stats()
+    except sqlite3.Error as e:
+        cache = {"error": str(e)}
+
+    return jsonify({
+        "analysis_cache": _analysis_cache_stats(),
+        "llm_breaker": llm_breaker.stats(),
+        "model_example_cache": cache,
+        "model_example_jobs": model_example_jobs.stats(),
+        "parse_stats": _parse_stats(),
+        "pregeneration": pregeneration.stats(),
+        "pregeneration_breaker": pregeneration_breaker.stats()
+    })
+
+
+def _analysis_cache_stats():
+    # Not imported here: a scrape must not load the analyzer and ANTLR.
+    # None until this worker has analyzed something.
+    analyzer = sys.modules.get("analysis.analyzer")
+    if analyzer is None:
+        return None
+    return analyzer.get_analysis_cache_stats()
+
+
+def _parse_stats():
+    # Same as above for the ANTLR runner (None until it is loaded)
+    parser_runner = sys.modules.get("analysis.parser_runner")
+    if parser_runner is None:
+        return None
+    return parser_runner.get_parse_stats()